@@ -18,24 +18,36 @@ import threading
 import time
 import curses
 import calendar
+import bisect
+import itertools
 import subprocess
 import shutil
 import re
 import yaml
 import json
+import copy
 import os
 import sys
 import logging
+import mmap
 import random
+import stat
 import string
-from datetime import datetime, timedelta
+import tempfile
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-import hashlib
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Import from task_creator.py
 from task_creator import TaskCreator, show_task_creation_form
 
+# Prefer libyaml's C loader/dumper when PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as _YLoader, CSafeDumper as _YDumper
+except ImportError:
+    from yaml import SafeLoader as _YLoader, SafeDumper as _YDumper
+
 # ---------------------------------------------------------------------
 # CONFIGURATION
 # ---------------------------------------------------------------------
@@ -57,7 +69,7 @@ def load_config():
     if CONFIG_FILE.exists():
         try:
             with CONFIG_FILE.open("r", encoding="utf-8") as f:
-                user_config = yaml.safe_load(f) or {}
+                user_config = yaml.load(f, Loader=_YLoader) or {}
                 config.update(user_config)
         except Exception as e:
             logging.error(f"Error loading config file {CONFIG_FILE}: {e}")
@@ -65,7 +77,7 @@ def load_config():
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         try:
             with CONFIG_FILE.open("w", encoding="utf-8") as f:
-                yaml.dump(DEFAULT_CONFIG, f, indent=2)
+                yaml.dump(DEFAULT_CONFIG, f, Dumper=_YDumper, indent=2)
             logging.info(f"Default config file created at {CONFIG_FILE}")
         except Exception as e:
             logging.error(f"Error creating default config file: {e}")
@@ -90,11 +102,126 @@ logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG,
 # YAML FRONTMATTER UTILITIES
 # ---------------------------------------------------------------------
 NOTES_METADATA_CACHE = {}
+
+# Frontmatter blocks larger than this are treated as missing rather than
+# reading on through what is probably a body without a closing "---".
+FRONTMATTER_MAX_BYTES = 64 * 1024
+FRONTMATTER_CHUNK_BYTES = 4096
+_FRONTMATTER_END_RE = re.compile(rb"^[ \t\r\f\v]*---[ \t\r\f\v]*$", re.MULTILINE)
+
+def _scan_frontmatter(fd, max_bytes=FRONTMATTER_MAX_BYTES):
+    """
+    Read fd from its current offset up to the closing "---" line. Returns
+    (buf, start, match): start is where the block begins after the opening
+    "---" line (0 when there is none), match is the closing line in buf or
+    None. The file is read in chunks and searched with a compiled pattern, so
+    the body past the chunk holding the marker is never loaded. Blocks larger
+    than max_bytes count as unclosed.
+    """
+    buf = os.read(fd, FRONTMATTER_CHUNK_BYTES)
+    start = buf.find(b"\n") + 1 or len(buf)
+    if buf[:start].strip() != b"---":
+        return buf, 0, None
+    pos = start
+    chunk = buf
+    while True:
+        # Only whole lines can be the marker, unless the file has ended.
+        end = buf.rfind(b"\n") + 1 if chunk else len(buf)
+        match = _FRONTMATTER_END_RE.search(buf, pos, end)
+        if match:
+            if max_bytes is not None and match.start() - start > max_bytes:
+                return buf, start, None
+            return buf, start, match
+        if not chunk or (max_bytes is not None and end - start > max_bytes):
+            return buf, start, None
+        pos = max(pos, end)
+        chunk = os.read(fd, FRONTMATTER_CHUNK_BYTES)
+        buf += chunk
+
+def read_frontmatter(file_path) -> bytes:
+    """
+    Raw bytes between the opening and closing "---" lines of file_path, or
+    None if it has no complete frontmatter block. I/O errors are left to the caller.
+    """
+    # Unbuffered reads on a bare descriptor: a typical note costs one open,
+    # one read and one close, without the stat a buffered file object makes.
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        buf, start, match = _scan_frontmatter(fd)
+    finally:
+        os.close(fd)
+    if not start or match is None:
+        return None
+    return buf[start:match.start()]
+
+def _pwrite_all(fd, data: bytes, offset: int):
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+def _replace_with_front(fd, file_path: Path, front: bytes, buf: bytes, body_at, tail: bytes):
+    """
+    Rewrite the note open on fd as front + its body from body_at (buf holds
+    the bytes already read from the start of the file) + tail. The new
+    contents go to a temporary file beside the note, which is synced and then
+    renamed over it, so a crash or a full disk part-way leaves the original
+    intact. body_at None drops the body.
+    """
+    # Replace the file a symlink points at, not the link itself.
+    target = Path(os.path.realpath(file_path))
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(tmp_fd, "wb") as out:
+            out.write(front)
+            if body_at is not None:
+                out.write(buf[body_at:])
+                while True:
+                    chunk = os.read(fd, 1 << 16)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+            out.write(tail)
+            out.flush()
+            os.fsync(out.fileno())
+        # mkstemp creates the file private to the user; keep the note's mode.
+        os.chmod(tmp_path, stat.S_IMODE(os.fstat(fd).st_mode))
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 class MetadataCache:
     def __init__(self):
         self.cache = {}
-        self.file_hashes = {}
-        self.file_mod_times = {}
+        self.file_stats = {}  # file_path -> (st_mtime_ns, st_size)
+        # Bumped when a cached entry changes (a reload with different
+        # metadata, or a rewrite), so results derived from many entries can
+        # tell whether any of them changed.
+        self._versions = itertools.count(1)
+        self.version = 0
+        # The prefetch workers and the diary index warmup fill the cache
+        # while the UI thread reads and rewrites it. Files are read and
+        # parsed outside the lock.
+        self.lock = threading.Lock()
+
+    def is_cached(self, file_path: Path) -> bool:
+        with self.lock:
+            return file_path in self.cache
+
+    def _store(self, file_path: Path, current_stat, metadata: dict):
+        with self.lock:
+            previous = self.cache.get(file_path)
+            self.cache[file_path] = metadata
+            self.file_stats[file_path] = current_stat
+            # A first load only adds an entry; anything built from the cache
+            # before it would have loaded the entry itself.
+            if previous is not None and previous != metadata:
+                self.version = next(self._versions)
 
     def get_note_metadata(self, file_path: Path):
         """
@@ -103,98 +230,118 @@ class MetadataCache:
         Otherwise, re-read the metadata, update the cache, and return it.
         """
         try:
-            mtime = file_path.stat().st_mtime
-        except Exception:
-            mtime = 0
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return {}
+        # mtime and size from the same stat call guard against same-tick writes.
+        mtime = (st.st_mtime_ns, st.st_size)
         cached = NOTES_METADATA_CACHE.get(file_path)
         if cached and cached['mtime'] == mtime:
             return cached['metadata']
-        # Else, read the metadata using the existing metadata_cache utility.
-        metadata = self.get_metadata(file_path)
+        # Else, read the metadata using the existing metadata_cache utility,
+        # handing over the stat result so the file is not stat()ed twice.
+        metadata = self.get_metadata(file_path, st)
         NOTES_METADATA_CACHE[file_path] = {'mtime': mtime, 'metadata': metadata}
         return metadata
 
-    def get_metadata(self, file_path: Path) -> dict:
-        if not file_path.exists():
-            return {}
-        try:
-            current_mod_time = file_path.stat().st_mtime
-        except Exception as e:
-            logging.error(f"Error getting mod time for {file_path}: {e}")
-            return {}
-
-        if file_path in self.cache and self.file_mod_times.get(file_path) == current_mod_time:
-            return self.cache[file_path]
+    def get_metadata(self, file_path: Path, st=None) -> dict:
+        if st is None:
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
+                return {}
+            except Exception as e:
+                logging.error(f"Error getting mod time for {file_path}: {e}")
+                return {}
+        current_stat = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            if self.file_stats.get(file_path) == current_stat and file_path in self.cache:
+                return self.cache[file_path]
 
         try:
-            with file_path.open("r", encoding="utf-8") as f:
-                lines = f.readlines()
+            yaml_bytes = read_frontmatter(file_path)
         except Exception as e:
             logging.error(f"Error reading {file_path}: {e}")
             return {}
-        if len(lines) < 3 or lines[0].strip() != "---":
-            return {}
-        yaml_lines = []
-        for line in lines[1:]:
-            if line.strip() == "---":
-                break
-            yaml_lines.append(line)
-        raw_yaml = "".join(yaml_lines)
-        current_hash = hashlib.sha256(raw_yaml.encode("utf-8")).hexdigest()
-        if file_path in self.cache and self.file_hashes.get(file_path) == current_hash:
-            return self.cache[file_path]
-        try:
-            metadata = yaml.safe_load(raw_yaml) or {}
-        except Exception as e:
-            logging.error(f"Error parsing YAML in {file_path}: {e}")
-            metadata = {}
-        self.cache[file_path] = metadata
-        self.file_hashes[file_path] = current_hash
-        self.file_mod_times[file_path] = current_mod_time
+        metadata = {}
+        if yaml_bytes:
+            try:
+                metadata = yaml.load(yaml_bytes.decode("utf-8"), Loader=_YLoader) or {}
+            except Exception as e:
+                logging.error(f"Error parsing YAML in {file_path}: {e}")
+        self._store(file_path, current_stat, metadata)
         return metadata
 
-    def rewrite_front_matter(self, file_path: Path, new_md: dict) -> bool:
+    def get_many(self, file_paths, file_stats=None) -> dict:
+        """
+        Returns {file_path: metadata} for file_paths. file_stats may map paths
+        to stat results the caller already has (None for a missing file), so
+        those files are not stat()ed a second time.
+        """
+        results = {}
+        for file_path in file_paths:
+            if file_stats is not None and file_path in file_stats:
+                st = file_stats[file_path]
+                results[file_path] = self.get_metadata(file_path, st) if st is not None else {}
+            else:
+                results[file_path] = self.get_metadata(file_path)
+        return results
+
+    def rewrite_front_matter(self, file_path: Path, new_md: dict, append: str = "") -> bool:
+        """
+        Replace the file's frontmatter with new_md (stamping dateModified).
+        Text given as append is added to the end of the body in the same write.
+        """
         new_md["dateModified"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        # Notes are edited by hand, so the block stays YAML even where JSON
+        # would dump faster; libyaml's dumper emits the UTF-8 bytes directly.
+        raw_yaml = yaml.dump(new_md, Dumper=_YDumper, sort_keys=False, encoding="utf-8")
+        front = b"---\n" + raw_yaml + b"---\n"
+        tail = append.encode("utf-8")
         try:
-            if file_path.exists():
-                with file_path.open("r", encoding="utf-8") as f:
-                    lines = f.readlines()
-            else:
-                lines = []
+            fd = os.open(file_path, os.O_RDWR | os.O_CREAT, 0o666)
         except Exception as e:
-            logging.error(f"Error reading file for rewrite {file_path}: {e}")
-            lines = []
-        front = ["---\n"] + yaml.dump(new_md, sort_keys=False).splitlines(keepends=True) + ["---\n"]
-        if lines and lines[0].strip() == "---":
-            try:
-                end_index = lines.index("---\n", 1)
-                rest = lines[end_index+1:]
-            except ValueError:
-                rest = []
-        else:
-            rest = lines
-        final_content = front + rest
+            logging.error(f"Error opening file for rewrite {file_path}: {e}")
+            return False
         try:
-            with file_path.open("w", encoding="utf-8") as f:
-                f.writelines(final_content)
+            buf, start, match = _scan_frontmatter(fd, max_bytes=None)
+            if not start:
+                body_at = 0
+            elif match is None:
+                # An unclosed block swallows the rest of the file.
+                body_at = None
+            else:
+                body_at = min(match.end() + 1, len(buf))
+            if body_at == len(front):
+                # Same-sized frontmatter (the usual status or priority
+                # toggle): overwrite it in place and leave the body alone.
+                _pwrite_all(fd, front, 0)
+                if tail:
+                    _pwrite_all(fd, tail, os.fstat(fd).st_size)
+            else:
+                _replace_with_front(fd, file_path, front, buf, body_at, tail)
         except Exception as e:
             logging.error(f"Error rewriting frontmatter for {file_path}: {e}")
             return False
-        self.cache[file_path] = new_md
+        finally:
+            os.close(fd)
+        # The frontmatter just written is exactly new_md, so the cache entry
+        # can be filled in without reading the file back.
         try:
-            with file_path.open("r", encoding="utf-8") as f:
-                lines = f.readlines()
-            yaml_lines = []
-            if lines and lines[0].strip() == "---":
-                for line in lines[1:]:
-                    if line.strip() == "---":
-                        break
-                    yaml_lines.append(line)
-            raw_yaml = "".join(yaml_lines)
-        except Exception as e:
-            raw_yaml = ""
+            st = file_path.stat()
+            current_stat = (st.st_mtime_ns, st.st_size)
+        except OSError as e:
             logging.error(f"Error updating cache for {file_path}: {e}")
-        self.file_hashes[file_path] = hashlib.sha256(raw_yaml.encode("utf-8")).hexdigest()
+            current_stat = None
+        with self.lock:
+            self.cache[file_path] = new_md
+            if current_stat is None:
+                self.file_stats.pop(file_path, None)
+            else:
+                self.file_stats[file_path] = current_stat
+            # Callers usually edit the cached dict in place before passing it
+            # here, so a rewrite always counts as a change.
+            self.version = next(self._versions)
         return True
 
 metadata_cache = MetadataCache()
@@ -202,57 +349,83 @@ metadata_cache = MetadataCache()
 # ---------------------------------------------------------------------
 # TIMEBLOCK CACHE & TEMPLATE FUNCTIONS
 # ---------------------------------------------------------------------
+_TB_HEADER_RE = re.compile(r'^\s*\|\s*Time\b.*Activity', re.MULTILINE)
+_TB_END_RE = re.compile(r'^(?![^\S\n]*$|\||[^\S\n]*\|-----)', re.MULTILINE)
+
+DEFAULT_TIMEBLOCK_TEXT = (
+    "\n## Timeblock\n\n"
+    "| Time  | Activity |\n"
+    "| ----- | -------- |\n"
+    + "".join(f"| {h:02d}:{m:02d} |          |\n" for h in range(5, 24) for m in (0, 30))
+)
+
+_TB_TABLE_HEADER = ("", "  Time  | Activity  ")
+
 class TimeblockCache:
     def __init__(self):
         self.cache = {}
-        self.file_hashes = {}
-        self.file_mod_times = {}
+        self.rendered = {}    # file_path -> table lines drawn by the timeblock panes
+        self.starts = {}      # file_path -> start minute of each entry (-1 if unparseable)
+        self.file_stats = {}  # file_path -> (st_mtime_ns, st_size)
 
     def get_timeblock(self, file_path: Path):
-        if not file_path.exists():
-            return []
-
         try:
-            current_mod_time = file_path.stat().st_mtime
+            st = file_path.stat()
+        except FileNotFoundError:
+            return []
         except Exception as e:
             logging.error(f"Error getting mod time for {file_path}: {e}")
             return []
+        current_stat = (st.st_mtime_ns, st.st_size)
+        cached_stat = self.file_stats.get(file_path)
 
-        if file_path in self.cache and self.file_mod_times.get(file_path) == current_mod_time:
+        if file_path in self.cache and cached_stat == current_stat:
             return self.cache[file_path]
 
+        # One bulk read; parse_timeblock finds the table with compiled patterns.
         try:
             with file_path.open("r", encoding="utf-8") as f:
-                contents = f.read()
+                text = f.read()
+            tb = self.parse_timeblock(text)
         except Exception as e:
             logging.error(f"Error reading timeblock file {file_path}: {e}")
             return []
-        current_hash = hashlib.sha256(contents.encode("utf-8")).hexdigest()
-        if file_path in self.cache and self.file_hashes.get(file_path) == current_hash:
-            return self.cache[file_path]
-        tb = self.parse_timeblock(contents)
-        self.cache[file_path] = tb
-        self.file_hashes[file_path] = current_hash
-        self.file_mod_times[file_path] = current_mod_time
+        self.store(file_path, tb, current_stat)
         return tb
 
+    def store(self, file_path: Path, tb, stat_key):
+        self.cache[file_path] = tb
+        self.rendered[file_path] = _TB_TABLE_HEADER + tuple(f"  {t} | {act} " for t, act in tb)
+        self.starts[file_path] = tuple(block_start_minute(t) for t, _ in tb)
+        self.file_stats[file_path] = stat_key
+
+    def get_table(self, file_path: Path):
+        """
+        Returns (block_starts, table_lines) for file_path. Both are built
+        once per file change rather than on every redraw.
+        """
+        if self.get_timeblock(file_path):
+            return self.starts[file_path], self.rendered[file_path]
+        return (), _TB_TABLE_HEADER
+
     def parse_timeblock(self, text: str):
-        lines = text.splitlines()
-        in_tb = False
+        header = _TB_HEADER_RE.search(text)
+        if not header:
+            return []
+        body_start = text.find("\n", header.end()) + 1
+        if not body_start:
+            return []
+        # Only the table itself is split into lines: it ends at the first line
+        # that is neither blank, a "|" row nor an indented separator.
+        end = _TB_END_RE.search(text, body_start)
         entries = []
-        for line in lines:
-            if line.strip().startswith("| Time") and "Activity" in line:
-                in_tb = True
+        for line in text[body_start:end.start() if end else len(text)].split("\n"):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("|-----"):
                 continue
-            if in_tb:
-                if line.strip() == "" or line.strip().startswith("|-----"):
-                    continue
-                if line.startswith("|"):
-                    parts = [p.strip() for p in line.strip("|").split("|")]
-                    if len(parts) >= 2:
-                        entries.append((parts[0], parts[1]))
-                else:
-                    break
+            parts = stripped.strip("|").split("|", 2)
+            if len(parts) >= 2:
+                entries.append((parts[0].strip(), parts[1].strip()))
         return entries
 
     def update_timeblock(self, file_path: Path, time_str: str, activity: str):
@@ -265,92 +438,68 @@ class TimeblockCache:
         in_tb = False
         updated = False
         for line in lines:
-            if line.strip().startswith("| Time") and "Activity" in line:
+            if _TB_HEADER_RE.match(line):
                 in_tb = True
                 new_lines.append(line)
                 continue
             if in_tb:
-                if line.strip().startswith("|-----"):
+                stripped = line.strip()
+                if stripped.startswith("|-----"):
                     new_lines.append(line)
                     continue
                 if line.startswith("|"):
-                    parts = [p.strip() for p in line.strip("|").split("|")]
-                    if parts and parts[0] == time_str:
+                    if stripped.strip("|").split("|", 1)[0].strip() == time_str:
                         new_lines.append(f"| {time_str} | {activity} |\n")
                         updated = True
                         continue
             new_lines.append(line)
         if not updated:
             for i, line in enumerate(new_lines):
-                if line.strip().startswith("| Time") and "Activity" in line:
+                if _TB_HEADER_RE.match(line):
                     new_lines.insert(i+2, f"| {time_str} | {activity} |\n")
                     updated = True
                     break
         try:
             with file_path.open("w", encoding="utf-8") as f:
                 f.writelines(new_lines)
-            self.get_timeblock(file_path)
+            # The edited lines are already in memory, so the cache entry is
+            # refreshed from them rather than by reading the file back.
+            st = file_path.stat()
+            self.store(file_path, self.parse_timeblock("".join(new_lines)), (st.st_mtime_ns, st.st_size))
         except Exception as e:
             logging.error(f"Error updating timeblock in {file_path}: {e}")
             return False, f"Error writing file: {e}"
+        return True, f"Updated {time_str}."
 
 timeblock_cache = TimeblockCache()
 
+def block_start_minute(t_str: str) -> int:
+    """Minute of the day an "HH:MM" timeblock entry starts at, or -1."""
+    try:
+        block_hour, block_min = map(int, t_str.split(":"))
+    except ValueError:
+        return -1
+    return block_hour * 60 + block_min
+
+def current_timeblock_index(block_starts, now: datetime) -> int:
+    """Index of the half-hour block in block_starts that contains now, or -1."""
+    now_min = now.hour * 60 + now.minute
+    for idx, block_start in enumerate(block_starts):
+        if 0 <= block_start <= now_min < block_start + 30:
+            return idx
+    return -1
+
 def add_default_timeblock(file_path: Path):
-    default_timeblock = [
-        "| Time  | Activity |",
-        "| ----- | -------- |",
-        "| 05:00 |          |",
-        "| 05:30 |          |",
-        "| 06:00 |          |",
-        "| 06:30 |          |",
-        "| 07:00 |          |",
-        "| 07:30 |          |",
-        "| 08:00 |          |",
-        "| 08:30 |          |",
-        "| 09:00 |          |",
-        "| 09:30 |          |",
-        "| 10:00 |          |",
-        "| 10:30 |          |",
-        "| 11:00 |          |",
-        "| 11:30 |          |",
-        "| 12:00 |          |",
-        "| 12:30 |          |",
-        "| 13:00 |          |",
-        "| 13:30 |          |",
-        "| 14:00 |          |",
-        "| 14:30 |          |",
-        "| 15:00 |          |",
-        "| 15:30 |          |",
-        "| 16:00 |          |",
-        "| 16:30 |          |",
-        "| 17:00 |          |",
-        "| 17:30 |          |",
-        "| 18:00 |          |",
-        "| 18:30 |          |",
-        "| 19:00 |          |",
-        "| 19:30 |          |",
-        "| 20:00 |          |",
-        "| 20:30 |          |",
-        "| 21:00 |          |",
-        "| 21:30 |          |",
-        "| 22:00 |          |",
-        "| 22:30 |          |",
-        "| 23:00 |          |",
-        "| 23:30 |          |"
-    ]
     try:
         with file_path.open("r", encoding="utf-8") as f:
-            lines = f.readlines()
+            contents = f.read()
     except FileNotFoundError:
-        lines = []
-    for line in lines:
-        if line.strip().startswith("| Time") and "Activity" in line:
-            return  # Already exists.
-    new_lines = lines + ["\n## Timeblock\n\n"] + [l + "\n" for l in default_timeblock]
+        contents = ""
+    if _TB_HEADER_RE.search(contents):
+        return  # Already exists.
     try:
-        with file_path.open("w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        with file_path.open("a", encoding="utf-8") as f:
+            f.write(DEFAULT_TIMEBLOCK_TEXT)
         timeblock_cache.get_timeblock(file_path)
         return True
     except Exception as e:
@@ -360,41 +509,110 @@ def add_default_timeblock(file_path: Path):
 # ---------------------------------------------------------------------
 # TASKS & INDEX FUNCTIONS (REWRITTEN & OPTIMIZED FOR ASYNC INDEXING)
 # ---------------------------------------------------------------------
-def read_file_content(file_path):
-    """Helper function to read file content, handling potential errors."""
+_NO_DUE_ORDINAL = (1 << 22) - 1
+PRIORITY_ORDER = {"high": 0, "normal": 1, "low": 2}
+_EMPTY_SET = frozenset()
+# Lookup sets derived from a task's frontmatter. They are rebuilt whenever a
+# task is parsed or restored and are left out of the saved index state.
+_DERIVED_TASK_KEYS = ("_tags_set", "_contexts_lc")
+
+def _encode_state_value(value):
+    """
+    json.dump default for the saved task index: YAML dates and datetimes are
+    tagged so _decode_state_value restores the same types. Anything else JSON
+    cannot hold raises TypeError.
+    """
+    if isinstance(value, datetime):
+        offset = value.utcoffset()
+        return {"__datetime__": [value.year, value.month, value.day, value.hour, value.minute,
+                                 value.second, value.microsecond,
+                                 None if offset is None else offset.total_seconds()]}
+    if isinstance(value, date):
+        return {"__date__": [value.year, value.month, value.day]}
+    raise TypeError(f"{type(value).__name__} is not saved in the task index")
+
+def _decode_state_value(obj: dict):
+    """json.load object_hook undoing _encode_state_value."""
+    if len(obj) == 1:
+        if "__date__" in obj:
+            return date(*obj["__date__"])
+        if "__datetime__" in obj:
+            *parts, offset = obj["__datetime__"]
+            tz = None if offset is None else timezone(timedelta(seconds=offset))
+            return datetime(*parts, tzinfo=tz)
+    return obj
+
+def add_task_lookups(md: dict) -> dict:
+    """
+    Attach the tag set and lower-cased context set that filtering tests against.
+    Status, priority, tag and context strings are interned on the way in: they
+    repeat across every task, and an interned value shares its object with the
+    literals it is compared to, so those comparisons succeed on identity.
+    """
+    for field in ("status", "priority"):
+        value = md.get(field)
+        if isinstance(value, str):
+            md[field] = sys.intern(value)
+    tags = md.get("tags")
+    if isinstance(tags, list):
+        tags = md["tags"] = [sys.intern(t) if isinstance(t, str) else t for t in tags]
+    contexts = md.get("contexts")
+    if isinstance(contexts, list):
+        contexts = md["contexts"] = [sys.intern(c) if isinstance(c, str) else c for c in contexts]
+    md["_tags_set"] = (frozenset(t for t in tags if isinstance(t, str))
+                       if isinstance(tags, list) else _EMPTY_SET)
+    md["_contexts_lc"] = (frozenset(c.lower() for c in contexts if isinstance(c, str))
+                          if isinstance(contexts, list) else _EMPTY_SET)
+    return md
+
+def due_ordinal(due):
+    """
+    Proleptic ordinal of a YYYY-MM-DD due string, or None when due is missing,
+    not a string, or malformed. Stored on each task by process_file so sorting
+    and overdue checks compare integers instead of re-parsing dates.
+    """
+    if not isinstance(due, str) or not due:
+        return None
     try:
-        with file_path.open("r", encoding="utf-8") as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logging.error(f"Error reading file {file_path}: {e}")
+        return datetime.strptime(due, "%Y-%m-%d").toordinal()
+    except ValueError:
         return None
 
 def process_file(file_path_str):
     import datetime  # Keep the import inside process_file as well for now
     file_path = Path(file_path_str)
-    content = read_file_content(file_path)
-    if content is None:
-        return None
-
-    if not content.startswith('---'):
+    try:
+        yaml_bytes = read_frontmatter(file_path)
+        if yaml_bytes is None:
+            return None
+        raw_yaml = yaml_bytes.decode("utf-8").strip()
+    except Exception as e:
+        logging.error(f"Error reading file {file_path}: {e}")
         return None
 
-    parts = content.split('---', 2)
-    if len(parts) < 3:
+    # Only notes tagged "task" are indexed, so a single substring scan can
+    # rule out the bulk of a notes directory before any YAML is parsed.
+    if "task" not in raw_yaml:
         return None
-
-    raw_yaml = parts[1].strip()
     md = {}
     try:
-        md = yaml.safe_load(raw_yaml) or {}
+        md = yaml.load(raw_yaml, Loader=_YLoader) or {}
     except Exception as e:
         logging.error(f"YAML parsing ERROR in {file_path}: {e}")
         return None
 
     if md is None:
         md = {}
+    return task_from_metadata(md, file_path_str)
+
 
+def task_from_metadata(md: dict, file_path_str: str) -> dict:
+    """
+    Turn parsed frontmatter into a task index entry: dates normalised to
+    strings, plus the derived fields the task views sort and filter on.
+    md is modified in place.
+    """
+    import datetime
     if 'date' in md:
         try:
             if isinstance(md['date'], datetime.date):  # Handle datetime.date objects
@@ -425,31 +643,143 @@ def process_file(file_path_str):
                 logging.error(f"ERROR converting 'due' to string in {file_path_str}: {conversion_error}")
                 md['due'] = None
 
-    md["file_path"] = str(file_path)
-    return md
+    md["_due_ordinal"] = due_ordinal(md.get("due"))
+    try:
+        orig_date = datetime.datetime.strptime(str(md.get("date", "")), "%Y-%m-%dT%H:%M:%S")
+        md["_orig_month"], md["_orig_day"] = orig_date.month, orig_date.day
+    except ValueError:
+        md["_orig_month"] = md["_orig_day"] = None
+    md["file_path"] = str(Path(file_path_str))
+    return add_task_lookups(md)
+
+
+# Fewer changed notes than this are parsed on the indexing thread itself; the
+# pool only pays for its hand-offs on larger batches.
+INDEX_POOL_MIN_FILES = 32
+_index_pool = None
+
+def get_index_pool():
+    """
+    The shared reindex pool, created on first use and kept for later reindexes.
+    process_file is mostly file reads and libyaml parsing, so threads overlap
+    the I/O without forking workers or pickling every parsed task back.
+    """
+    global _index_pool
+    if _index_pool is None:
+        _index_pool = ThreadPoolExecutor(max_workers=min(16, 2 * (os.cpu_count() or 1)))
+    return _index_pool
+
+# Directories the task index never looks into. Matching the name's tail keeps
+# the old "templates/" and ".zk/" substring semantics for every level below
+# the notes root.
+_EXCLUDED_DIR_RE = re.compile(r"(?:templates|\.zk)\Z")
+
+def walk_md(root, exclude_dir=None):
+    """
+    Yield (path, DirEntry) for every *.md file under root. Directory types
+    come from the scandir entries, so walking costs no stat per file; the
+    caller stats only the entries it keeps, through DirEntry.stat().
+    Directories whose name matches the exclude_dir pattern are not entered.
+    """
+    pending = [os.fspath(root)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError as e:
+            logging.warning(f"Could not scan {e.filename}: {e}")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if exclude_dir is None or not exclude_dir.search(entry.name):
+                        pending.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield entry.path, entry
 
 
 class TaskManager:
+    # Bump when the saved index layout or process_file's output changes, so an
+    # index saved by an older version is rebuilt instead of trusted.
+    INDEX_STATE_VERSION = 4
+    # Seconds between the idle rescans that pick up notes edited outside the app.
+    RESCAN_INTERVAL = 30
+
     def __init__(self, notes_dir: Path, index_state_file: Path):
         self.notes_dir = notes_dir
         self.index_state_file = index_state_file
         self.tasks_cache = []
+        self._due_priorities = None  # (tasks_cache it was built from, {date_str: priority})
+        self._filtered = (None, {})  # (tasks_cache they were built from, {filter key: tasks})
         self.dirty = True
         self.is_indexing = False
         self.index_lock = threading.Lock()
+        self._last_scan = time.monotonic()
+        # Reindexes and rescans run on one long-lived worker thread, woken
+        # through _index_wake, instead of a new thread per request.
+        self._index_wake = threading.Event()
+        self._reindex_requested = False
+        self._index_thread = None
         self.previous_index_state = self._load_index_state()
-        logging.debug(f"TaskManager.__init__: Initial previous_index_state: {self.previous_index_state}")
+        logging.debug(f"TaskManager.__init__: Restored index state for {len(self.previous_index_state)} files")
         if not self.is_indexing:
             self._start_background_reindex()
 
     def _load_index_state(self):
-        return {}
+        """
+        Restore the per-file (st_mtime_ns, st_size) state and the parsed tasks
+        saved by the last reindex, so that a restart only re-parses notes that
+        changed since then. Returns the file state; tasks go to tasks_cache.
+        """
+        try:
+            with self.index_state_file.open('r', encoding='utf-8') as f:
+                saved = json.load(f, object_hook=_decode_state_value)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.error(f"_load_index_state: Error loading index state from {self.index_state_file}: {e}")
+            return {}
+        if not isinstance(saved, dict) or saved.get("version") != self.INDEX_STATE_VERSION:
+            return {}
+        self.tasks_cache = [add_task_lookups(task) for task in saved.get("tasks", [])]
+        return saved.get("files", {})
 
-    def _save_index_state(self, index_state):
+    def _save_index_state(self, index_state, tasks):
+        """
+        Save the file state and parsed tasks for _load_index_state. A task
+        holding a value JSON cannot represent (beyond the tagged dates) is
+        left out together with its file's state, so the next start parses
+        the note again rather than restoring it altered. The file is written
+        beside the old one and renamed over it, so a crash cannot leave it
+        truncated.
+        """
+        files = dict(index_state)
+        saved_tasks = []
+        for task in tasks:
+            saved = {k: v for k, v in task.items() if k not in _DERIVED_TASK_KEYS}
+            try:
+                saved_tasks.append(json.dumps(saved, default=_encode_state_value))
+            except (TypeError, ValueError) as e:
+                logging.info(f"_save_index_state: Not saving {task.get('file_path')}: {e}")
+                files.pop(task.get("file_path"), None)
+        payload = '{"version": %d, "files": %s, "tasks": [\n%s\n]}\n' % (
+            self.INDEX_STATE_VERSION, json.dumps(files), ",\n".join(saved_tasks))
         try:
-            self.index_state_file.parent.mkdir(parents=True, exist_ok=True)
-            with self.index_state_file.open('w', encoding='utf-8') as f:
-                json.dump(index_state, f, indent=2)
+            state_dir = self.index_state_file.parent
+            state_dir.mkdir(parents=True, exist_ok=True)
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix=f".{self.index_state_file.name}.", suffix=".tmp",
+                                                dir=state_dir)
+            try:
+                with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.index_state_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
         except Exception as e:
             logging.error(f"_save_index_state: Error saving index state to {self.index_state_file}: {e}")
             logging.error(f"_save_index_state: Finished - Error saving state.")
@@ -457,56 +787,60 @@ class TaskManager:
     def _rebuild_index(self):
         current_index_state = {}
         updated_tasks_metadata = []
-        files = list(self.notes_dir.rglob("*.md"))
+        files = []
         files_to_process = []
-        exclude_patterns = ["templates/", ".zk/"]
 
         existing_tasks_dict = {task['file_path']: task for task in self.tasks_cache}
+        previous_state = dict(self.previous_index_state)
 
         is_first_run = not self.previous_index_state
 
         if is_first_run:
             logging.info("Performing full initial task index rebuild.")
 
-        for file_path in files:
-            is_excluded = False
-            for pattern in exclude_patterns:
-                if pattern in str(file_path):
-                    is_excluded = True
-                    break
-            if is_excluded:
-                current_index_state[str(file_path)] = self.previous_index_state.get(str(file_path), None)
-                continue
-
+        # Excluded directories are pruned during the walk, so nothing below
+        # them is listed or stat()ed.
+        for file_path, entry in walk_md(self.notes_dir, _EXCLUDED_DIR_RE):
+            files.append(file_path)
             try:
-                mod_time = os.path.getmtime(file_path)
-                current_index_state[str(file_path)] = mod_time
+                st = entry.stat()
+                file_state = [st.st_mtime_ns, st.st_size]
+                current_index_state[file_path] = file_state
 
                 if is_first_run:
                     files_to_process.append(file_path)
-                elif str(file_path) not in self.previous_index_state or self.previous_index_state[str(file_path)] < mod_time:
+                elif self.previous_index_state.get(file_path) != file_state:
                     files_to_process.append(file_path)
             except OSError:
                 logging.warning(f"Warning: Could not get mod time for {file_path}. Possibly deleted.")
-                if str(file_path) in self.previous_index_state:
+                if file_path in self.previous_index_state:
                     logging.info(f"File {file_path} likely deleted, removing from index state and cache.")
-                    if str(file_path) in existing_tasks_dict:
-                        del existing_tasks_dict[str(file_path)]
-                    del self.previous_index_state[str(file_path)]
+                    if file_path in existing_tasks_dict:
+                        del existing_tasks_dict[file_path]
+                    del self.previous_index_state[file_path]
+
+        if not is_first_run and current_index_state == previous_state:
+            # Nothing was added, changed or removed: keep the same list so
+            # nothing keyed on it is rebuilt, and skip rewriting the state file.
+            return self.tasks_cache
 
         files_to_process.sort()
         new_tasks_metadata = []
-        with ProcessPoolExecutor(max_workers=8) as executor:
-            futures = {executor.submit(process_file, str(f)): f for f in files_to_process}
-            for future in as_completed(futures):
-                md = future.result()
-                if md and isinstance(md.get("tags"), list) and "task" in md.get("tags"):
-                    new_tasks_metadata.append(md)
-
+        if len(files_to_process) < INDEX_POOL_MIN_FILES:
+            results = map(process_file, files_to_process)
+        else:
+            results = get_index_pool().map(process_file, files_to_process)
+        for md in results:
+            if md and "task" in md["_tags_set"]:
+                new_tasks_metadata.append(md)
+
+        # A re-parsed note may no longer be a task; drop its old entry first.
+        for file_path in files_to_process:
+            existing_tasks_dict.pop(file_path, None)
         for task_md in new_tasks_metadata:
             existing_tasks_dict[task_md['file_path']] = task_md
 
-        files_in_current_scan = set(str(f) for f in files)
+        files_in_current_scan = set(files)
         cached_files = set(existing_tasks_dict.keys())
         deleted_files_from_cache = cached_files - files_in_current_scan
         for deleted_file_path in deleted_files_from_cache:
@@ -514,37 +848,8 @@ class TaskManager:
             del existing_tasks_dict[deleted_file_path]
 
         updated_tasks_list = list(existing_tasks_dict.values())
-
-        def is_overdue(task):
-            due = task.get("due")
-            status = self.get_effective_status(task, datetime.now())
-            if due and status != "done":
-                if not isinstance(due, str):
-                    logging.warning(
-                        f"WARNING: Task '{task.get('title')}' has a non-string 'due' date: type={type(due)}, value='{due}'. Skipping overdue check.")
-                    return False
-                try:
-                    due_date = datetime.strptime(due, "%Y-%m-%d")
-                    return due_date.date() < datetime.now().date()
-                except ValueError:
-                    logging.warning(
-                        f"WARNING: Task '{task.get('title')}' has invalid 'due' date format: value='{due}'. Skipping overdue check.")
-                    return False
-            return False
-
-        def sort_key(task):
-            overdue = is_overdue(task)
-            due = task.get("due")
-            try:
-                due_date = datetime.strptime(due, "%Y-%m-%d") if due else datetime.max
-            except Exception:
-                due_date = datetime.max
-            priority = task.get("priority", "normal")
-            priority_order = {"high": 0, "normal": 1, "low": 2}
-            return (not overdue, priority_order.get(priority, 1), due_date)
-
-        updated_tasks_list.sort(key=sort_key)
-        self._save_index_state(current_index_state)
+        self.sort_tasks(updated_tasks_list, datetime.now())
+        self._save_index_state(current_index_state, updated_tasks_list)
         self.previous_index_state = current_index_state
         return updated_tasks_list
 
@@ -558,16 +863,94 @@ class TaskManager:
                 updated_tasks = self._rebuild_index()
                 self.tasks_cache = updated_tasks
                 self.dirty = False
+                self._last_scan = time.monotonic()
             except Exception as e:
                 logging.error(f"Background task index rebuild with sorting failed: {e}")
             finally:
                 self.is_indexing = False
 
+    def rescan_if_stale(self):
+        """
+        Start a quiet rescan when RESCAN_INTERVAL has passed since the last one,
+        so notes edited, added or removed outside the app (an editor, a git
+        pull) reach the task list. The rescan only stats unchanged notes and
+        leaves tasks_cache untouched when nothing changed.
+        """
+        if self.is_indexing or time.monotonic() - self._last_scan < self.RESCAN_INTERVAL:
+            return
+        self._last_scan = time.monotonic()
+        self._wake_index_worker()
+
+    def _wake_index_worker(self):
+        if self._index_thread is None:
+            self._index_thread = threading.Thread(target=self._index_worker, daemon=True)
+            self._index_thread.start()
+        self._index_wake.set()
+
+    def _index_worker(self):
+        while True:
+            self._index_wake.wait()
+            self._index_wake.clear()
+            if self._reindex_requested:
+                # A full reindex covers anything a pending rescan would find.
+                self._reindex_requested = False
+                self._background_reindex_task()
+            else:
+                self._rescan()
+
+    def _rescan(self):
+        # Unlike _background_reindex_task this leaves is_indexing alone, so
+        # the "Indexing tasks..." notice does not flash on every poll.
+        if not self.index_lock.acquire(blocking=False):
+            return
+        try:
+            self.tasks_cache = self._rebuild_index()
+        except Exception as e:
+            logging.error(f"Task rescan failed: {e}")
+        finally:
+            self.index_lock.release()
+
+    def refresh_task(self, task_path: Path, md: dict = None):
+        """
+        Update a single note's entry in tasks_cache after the app has changed
+        or deleted it, instead of rescanning the notes tree. md is the
+        frontmatter just written, if the caller has it; the note is then not
+        read or parsed again. A reindex already in progress is left to pick
+        the change up.
+        """
+        if not self.index_lock.acquire(blocking=False):
+            self.dirty = True
+            return
+        try:
+            path_str = str(task_path)
+            tasks = [task for task in self.tasks_cache if task["file_path"] != path_str]
+            try:
+                st = os.stat(path_str)
+            except FileNotFoundError:
+                self.previous_index_state.pop(path_str, None)
+            else:
+                if md is not None:
+                    # A copy, so normalising it leaves metadata_cache's entry
+                    # exactly as it will be written next time.
+                    task = task_from_metadata(copy.deepcopy(md), path_str)
+                else:
+                    task = process_file(path_str)
+                if task and "task" in task["_tags_set"]:
+                    tasks.append(task)
+                self.previous_index_state[path_str] = [st.st_mtime_ns, st.st_size]
+            self.sort_tasks(tasks, datetime.now())
+            # A new list, so caches keyed on the tasks_cache object notice.
+            self.tasks_cache = tasks
+        finally:
+            self.index_lock.release()
+
     def _start_background_reindex(self):
-        if not self.is_indexing:
-            thread = threading.Thread(target=self._background_reindex_task)
-            thread.daemon = True
-            thread.start()
+        # load_tasks calls this on every frame while dirty; one queued
+        # request is enough.
+        if self.is_indexing or self._reindex_requested:
+            return
+        self._reindex_requested = True
+        self._wake_index_worker()
 
     def load_tasks(self, current_date: datetime):
         if self.dirty:
@@ -582,34 +965,42 @@ class TaskManager:
             else:
                 tasks.append(note)
 
+        self.sort_tasks(tasks, current_date)
+        return tasks
+
+    def sort_tasks(self, tasks: list, current_date: datetime):
+        """
+        Sort tasks in place: overdue first, then by priority, then by due date.
+        Due dates come from the _due_ordinal that process_file stored, so no
+        date is parsed while sorting.
+        """
+        today = current_date.toordinal()
+
         def is_overdue(task):
             due = task.get("due")
-            status = self.get_effective_status(task, current_date)
-            if due and status != "done":
-                 if not isinstance(due, str):
-                     logging.warning(f"WARNING: Task '{task.get('title')}' has a non-string 'due' date: type={type(due)}, value='{due}'. Skipping overdue check.")
-                     return False
-                 try:
-                    due_date = datetime.strptime(due, "%Y-%m-%d")
-                    return due_date.date() < current_date.date()
-                 except ValueError:
+            if due and self.get_effective_status(task, current_date) != "done":
+                if not isinstance(due, str):
+                    logging.warning(f"WARNING: Task '{task.get('title')}' has a non-string 'due' date: type={type(due)}, value='{due}'. Skipping overdue check.")
+                    return False
+                ordinal = task.get("_due_ordinal")
+                if ordinal is None:
                     logging.warning(f"WARNING: Task '{task.get('title')}' has invalid 'due' date format: value='{due}'. Skipping overdue check.")
                     return False
+                return ordinal < today
             return False
 
+
+        # (not overdue, priority, due ordinal) packed into one int, so the sort
+        # compares plain ints rather than tuples. Ordinals up to 9999-12-31
+        # fit in 22 bits; tasks without a valid due date sort last.
         def sort_key(task):
-            overdue = is_overdue(task)
-            due = task.get("due")
-            try:
-                due_date = datetime.strptime(due, "%Y-%m-%d") if due else datetime.max
-            except Exception:
-                due_date = datetime.max
-            priority = task.get("priority", "normal")
-            priority_order = {"high": 0, "normal": 1, "low": 2}
-            return (not overdue, priority_order.get(priority, 1), due_date)
+            ordinal = task.get("_due_ordinal")
+            if ordinal is None:
+                ordinal = _NO_DUE_ORDINAL
+            priority = PRIORITY_ORDER.get(task.get("priority", "normal"), 1)
+            return (0 if is_overdue(task) else 1) << 24 | priority << 22 | ordinal
 
         tasks.sort(key=sort_key)
-        return tasks
 
     def _is_task_due_today(self, task: dict, current_date: datetime) -> bool:
         rec = task.get("recurrence")
@@ -638,15 +1029,11 @@ class TaskManager:
             else:
                 return False
         elif frequency == "yearly":
-            date_value_for_strptime = task.get("date", "")
-            date_value_for_strptime_str = str(date_value_for_strptime)
-            try:
-                orig_date = datetime.strptime(date_value_for_strptime_str, "%Y-%m-%dT%H:%M:%S")
-            except Exception as e:
-                orig_date = datetime.combine(current_date.date(), datetime.time.min)
-
-            orig_day = orig_date.day if isinstance(orig_date, (datetime,)) else current_date.day
-            if current_date.month == orig_date.month and current_date.day == int(rec.get("day_of_month", orig_day)):
+            # process_file parsed the task's date once; without one the task
+            # recurs on the current month.
+            orig_month = task.get("_orig_month") or current_date.month
+            orig_day = task.get("_orig_day") or current_date.day
+            if current_date.month == orig_month and current_date.day == int(rec.get("day_of_month", orig_day)):
                 return True
             else:
                 return False
@@ -664,10 +1051,19 @@ class TaskManager:
             return task.get("status", "open")
 
     def filter_tasks(self, status_filter: str, current_date: datetime, context_filter: str = None):
+        # Redraws and scrolling ask for the same filter repeatedly; results are
+        # kept per (filter, day) until a reindex or task edit replaces tasks_cache.
+        key = (status_filter, context_filter, current_date.toordinal())
+        tasks = self.tasks_cache
+        if not self.dirty:
+            built_from, results = self._filtered
+            if built_from is tasks and key in results:
+                return results[key]
         filtered_tasks = []
         loaded_tasks = self.load_tasks(current_date)
+        context_lc = context_filter.lower() if context_filter is not None else None
         for task in loaded_tasks:
-            is_archived = isinstance(task.get("tags"), list) and "archive" in task.get("tags")
+            is_archived = "archive" in task.get("_tags_set", _EMPTY_SET)
             if status_filter == "archive":
                 if is_archived:
                     filtered_tasks.append(task)
@@ -675,25 +1071,58 @@ class TaskManager:
                 if not is_archived:
                     effective_status = self.get_effective_status(task, current_date)
                     status_match = (status_filter == "all" or effective_status == status_filter or task.get("status", "open") == status_filter)
-                    context_match = (context_filter is None or (isinstance(task.get("contexts"), list) and context_filter.lower() in [c.lower() for c in task.get("contexts", [])]))
+                    context_match = context_lc is None or context_lc in task.get("_contexts_lc", _EMPTY_SET)
                     if status_match and context_match:
                         filtered_tasks.append(task)
+        if not self.dirty:
+            built_from, results = self._filtered
+            if built_from is not tasks or len(results) >= 16:
+                results = {}
+                self._filtered = (tasks, results)
+            results[key] = filtered_tasks
         return filtered_tasks
 
     def get_tasks_due_on_date(self, date_obj: datetime.date) -> list:
+        # Compares the ordinal stored at index time rather than parsing every
+        # due string again on each preview redraw.
+        target = date_obj.toordinal()
         due_tasks = []
         for task in self.tasks_cache:
             due_str = task.get("due")
-            status = task.get("status")
-            if due_str:
-                try:
-                    due_date = datetime.strptime(due_str, "%Y-%m-%d").date()
-                    if due_date == date_obj and status != "done":
-                        due_tasks.append(task)
-                except ValueError:
-                    logging.warning(f"Invalid due date format '{due_str}' in task: {task.get('title')}")
+            if not due_str:
+                continue
+            due_ord = task.get("_due_ordinal")
+            if due_ord is None:
+                logging.warning(f"Invalid due date format '{due_str}' in task: {task.get('title')}")
+            elif due_ord == target and task.get("status") != "done":
+                due_tasks.append(task)
         return due_tasks
 
+    def due_priorities(self) -> dict:
+        """
+        {due date string: highest priority} over tasks that are not done,
+        rebuilt only when a reindex replaces tasks_cache.
+        """
+        tasks = self.tasks_cache
+        if self._due_priorities is not None and self._due_priorities[0] is tasks:
+            return self._due_priorities[1]
+        result = {}
+        for task in tasks:
+            due_str = task.get("due")
+            if not due_str or task.get("status") == "done":
+                continue
+            ordinal = task.get("_due_ordinal")
+            if ordinal is None:
+                logging.warning(f"Invalid due date format '{due_str}' in task: {task.get('title')}")
+                continue
+            due_date = date.fromordinal(ordinal)
+            key = date_key(due_date.year, due_date.month, due_date.day)
+            priority = task.get("priority", "normal")
+            if key not in result or PRIORITY_ORDER.get(priority, 1) < PRIORITY_ORDER.get(result[key], 1):
+                result[key] = priority
+        self._due_priorities = (tasks, result)
+        return result
+
     def toggle_task_status(self, task_path: Path):
         md = metadata_cache.get_metadata(task_path)
         today_str = datetime.now().strftime("%Y-%m-%d")
@@ -712,7 +1141,7 @@ class TaskManager:
 
         if metadata_cache.rewrite_front_matter(task_path, md):
             logging.info(f"Updated task status for {task_path}")
-            self.dirty = True
+            self.refresh_task(task_path, md)
             return True
         else:
             logging.error(f"Failed to update task status for {task_path}")
@@ -726,7 +1155,7 @@ class TaskManager:
 
         if metadata_cache.rewrite_front_matter(task_path, md):
             logging.info(f"Set task {task_path} priority to {new_priority}")
-            self.dirty = True
+            self.refresh_task(task_path, md)
             return True
         else:
             logging.error(f"Failed to update task priority for {task_path}")
@@ -736,7 +1165,7 @@ class TaskManager:
         try:
             task_path.unlink()
             logging.info(f"Deleted task: {task_path}")
-            self.dirty = True
+            self.refresh_task(task_path)
             return True
         except Exception as e:
             logging.error(f"Error deleting task {task_path}: {e}")
@@ -759,7 +1188,7 @@ class TaskManager:
 
         if metadata_cache.rewrite_front_matter(task_path, md):
             logging.info(f"Set task {task_path} archive status to {archive}")
-            self.dirty = True
+            self.refresh_task(task_path, md)
             return True
         else:
             logging.error(f"Failed to update task archive status for {task_path}")
@@ -769,63 +1198,423 @@ class TaskManager:
 # ---------------------------------------------------------------------
 # HELPER FUNCTIONS (DIARY, SEARCH, LINKS, ETC.)
 # ---------------------------------------------------------------------
-def calculate_week_stats_from_date(start_of_week: datetime) -> dict:
+@lru_cache(maxsize=512)
+def week_start_for(day):
+    """Sunday on or before the given date (weeks start on Sunday)."""
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+# (week start date, per-day file stats) -> stats dict, oldest entry first.
+_week_stats_cache = {}
+_WEEK_STATS_CACHE_SIZE = 8
+
+def sum_diary_stats(metadata_list) -> tuple:
+    """(pomodoros, workout days, meditation days) summed over metadata dicts."""
     total_pomodoros = 0
     total_workouts = 0
     days_meditated = 0
-    for i in range(7):
-        current = start_of_week + timedelta(days=i)
-        file_path = DIARY_DIR / f"{current.strftime('%Y-%m-%d')}.md"
-        md = metadata_cache.get_metadata(file_path)
+    for md in metadata_list:
         total_pomodoros += int(md.get("pomodoros", 0))
         if md.get("workout", False):
             total_workouts += 1
         if md.get("meditate", False):
             days_meditated += 1
-    return {
+    return total_pomodoros, total_workouts, days_meditated
+
+@lru_cache(maxsize=64)
+def week_diary_paths(week_start_day) -> tuple:
+    """The seven diary file paths of the week starting on week_start_day."""
+    return tuple(DIARY_DIR / f"{(week_start_day + timedelta(days=i)).strftime('%Y-%m-%d')}.md"
+                 for i in range(7))
+
+def calculate_week_stats_from_date(start_of_week: datetime) -> dict:
+    # A status bar redraw only stats the week's seven files; the paths are
+    # built once per week and the totals come from the cache unless one of
+    # the files changed.
+    week_day = start_of_week.date()
+    file_paths = week_diary_paths(week_day)
+    file_stats = {}
+    for file_path in file_paths:
+        try:
+            file_stats[file_path] = os.stat(file_path)
+        except OSError:
+            file_stats[file_path] = None
+    key = (week_day,
+           tuple((st.st_mtime_ns, st.st_size) if st else None for st in file_stats.values()))
+    cached = _week_stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    total_pomodoros, total_workouts, days_meditated = sum_diary_stats(
+        metadata_cache.get_many(file_paths, file_stats).values())
+    stats = {
         "total_pomodoros": total_pomodoros,
         "total_workouts": total_workouts,
         "days_meditated": days_meditated,
         "week_start": start_of_week.strftime("%Y-%m-%d"),
         "week_end": (start_of_week + timedelta(days=6)).strftime("%Y-%m-%d")
     }
+    if len(_week_stats_cache) >= _WEEK_STATS_CACHE_SIZE:
+        del _week_stats_cache[next(iter(_week_stats_cache))]
+    _week_stats_cache[key] = stats
+    return stats
      
 
+# Dates (YYYY-MM-DD) that have a diary file. The directory is only rescanned
+# when its own mtime changes, i.e. when entries are added, removed or renamed.
+_diary_dates_cache = {"mtime": None, "dates": frozenset()}
+
+def existing_diary_dates() -> frozenset:
+    try:
+        mtime = os.stat(DIARY_DIR).st_mtime_ns
+    except OSError:
+        return frozenset()
+    if _diary_dates_cache["mtime"] != mtime:
+        # is_file() is answered from the directory entry's d_type on Linux,
+        # so the listing costs no per-file stat.
+        with os.scandir(DIARY_DIR) as entries:
+            dates = frozenset(entry.name[:-3] for entry in entries
+                              if entry.name.endswith(".md") and not entry.name.startswith(".")
+                              and entry.is_file())
+        _diary_dates_cache["mtime"] = mtime
+        _diary_dates_cache["dates"] = dates
+    return _diary_dates_cache["dates"]
+
+# Sorted note file names, rescanned on the same directory-mtime rule, so task
+# actions find a note by its zettelid prefix without globbing NOTES_DIR.
+_note_names_cache = {"mtime": None, "names": ()}
+
+def note_file_for_prefix(prefix) -> Path:
+    """First note file in NOTES_DIR whose name starts with prefix, or None."""
+    if not isinstance(prefix, str):
+        return None
+    try:
+        mtime = os.stat(NOTES_DIR).st_mtime_ns
+    except OSError:
+        return None
+    if _note_names_cache["mtime"] != mtime:
+        with os.scandir(NOTES_DIR) as entries:
+            names = sorted(entry.name for entry in entries
+                           if entry.name.endswith(".md") and not entry.name.startswith(".")
+                           and entry.is_file())
+        _note_names_cache["mtime"] = mtime
+        _note_names_cache["names"] = names
+    names = _note_names_cache["names"]
+    for i in range(bisect.bisect_left(names, prefix), len(names)):
+        if not names[i].startswith(prefix):
+            break
+        file = NOTES_DIR / names[i]
+        if file.is_file():
+            return file
+    return None
+
 def get_diary_preview(date_str: str) -> str:
+    # Opening straight away answers "does it exist" in the same syscall.
     file_path = DIARY_DIR / f"{date_str}.md"
-    if file_path.exists():
+    try:
+        with open(file_path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return f"No diary entry for {date_str}."
+    except Exception as e:
+        logging.error(f"Error reading diary preview {file_path}: {e}")
+        return f"Error reading diary entry for {date_str}."
+
+def preview_stat_key(date_str: str):
+    """(st_mtime_ns, st_size) of the diary entry for date_str, (0, 0) if missing."""
+    try:
+        st = (DIARY_DIR / f"{date_str}.md").stat()
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+# Entries at least this large are not mirrored in memory by DiaryIndex; they
+# are searched through a read-only mmap instead. Smaller files are cheaper to
+# keep as a lowercased copy than to map on every search.
+MMAP_MIN_SIZE = 64 * 1024
+# Below this many changed entries a refresh reads them on the calling thread.
+PARALLEL_READ_MIN_FILES = 32
+
+def mmap_search(file_path: Path, pattern) -> bool:
+    """Return True if the compiled bytes pattern occurs in file_path."""
+    with file_path.open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return pattern.search(mm) is not None
+
+def mmap_find(file_path: Path, needle: bytes) -> bool:
+    """Return True if needle occurs verbatim in file_path."""
+    with file_path.open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(needle) != -1
+
+def metadata_search_text(md) -> str:
+    """
+    The keys and scalar values of a metadata dict, lowercased, one per line.
+    Searching this instead of str(md) skips the repr's quotes, braces and
+    commas, so queries cannot match dict syntax or run across two fields.
+    """
+    parts = []
+    stack = [md]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                parts.append(str(key))
+                stack.append(item)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif value is not None:
+            parts.append(str(value))
+    return "\n".join(parts).lower()
+
+# bytes.isascii() needs Python 3.7; a search for a high byte works everywhere.
+_NON_ASCII_RE = re.compile(rb"[\x80-\xff]")
+
+def byte_trigrams(data: bytes) -> set:
+    """Every distinct three-byte substring of data."""
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+class DiaryIndex:
+    """
+    In-memory index of the diary entries in DIARY_DIR, keyed by date string.
+    refresh() stats every entry and re-reads only the files whose mtime or
+    size changed since the previous refresh, so searches and tag filters
+    no longer read the whole directory each time.
+
+    Entries mirrored in memory are also in a trigram index: each three-byte
+    sequence of the lowercased text maps to the set of entries containing it.
+    A search intersects the sets of the query's trigrams, smallest first, and
+    only confirms the surviving candidates with a substring test.
+
+    The index is built on a background thread at startup (warm_diary_index).
+    refresh, search and filter_by_tag all hold lock, so a search made during
+    that build waits for it rather than reading half-updated postings. The
+    lock is reentrant, so callers can hold it across a refresh and a search.
+    """
+    def __init__(self, diary_dir: Path):
+        self.diary_dir = diary_dir
+        self.lock = threading.RLock()
+        self.file_stats = {}     # date_str -> (st_mtime_ns, st_size)
+        self.by_date = {}        # date_str -> frontmatter metadata
+        self.file_tags = {}      # date_str -> tags indexed for that entry
+        self.tags_inverted = {}  # tag -> set of date_str
+        self.content_lc = {}     # date_str -> lowercased file contents (UTF-8 bytes)
+        self.large_files = {}    # date_str -> path of entries searched via mmap
+        self.metadata_lc = {}    # date_str -> metadata_search_text of the entry
+        self.trigrams = {}       # lowercased 3-byte sequence -> set of date_str
+
+    def refresh(self):
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self):
+        seen = set()
+        changed = []
+        # scandir entries carry the name and type, so unchanged entries cost
+        # one stat and no Path object or pattern match.
         try:
-            return file_path.read_text(encoding="utf-8")
-        except Exception as e:
-            logging.error(f"Error reading diary preview {file_path}: {e}")
-            return f"Error reading diary entry for {date_str}."
-    return f"No diary entry for {date_str}."
+            with os.scandir(self.diary_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".md"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError as e:
+                        logging.error(f"Error indexing file {entry.path}: {e}")
+                        continue
+                    date_str = name[:-3]
+                    seen.add(date_str)
+                    current_stat = (st.st_mtime_ns, st.st_size)
+                    if self.file_stats.get(date_str) == current_stat:
+                        continue
+                    changed.append((date_str, Path(entry.path), current_stat))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error scanning {self.diary_dir}: {e}")
+        # Reading is I/O bound and releases the GIL, so a cold index build
+        # reads files on a small pool; the index itself is only updated here.
+        if len(changed) >= PARALLEL_READ_MIN_FILES:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                loaded = list(executor.map(self._load_content, changed))
+        else:
+            loaded = [self._load_content(item) for item in changed]
+        for (date_str, file, current_stat), content_lc in zip(changed, loaded):
+            if isinstance(content_lc, Exception):
+                logging.error(f"Error indexing file {file}: {content_lc}")
+                self._drop(date_str)
+                continue
+            self._index_file(date_str, file, current_stat, content_lc)
+        for date_str in set(self.file_stats) - seen:
+            self._drop(date_str)
 
-def search_diary(query: str):
-    query = query.lower()
-    results = []
-    for file in DIARY_DIR.glob("*.md"):
+    @staticmethod
+    def _load_content(item):
+        """
+        Return the lowercased UTF-8 mirror for an entry, None for entries
+        searched via mmap, or the exception raised while reading it.
+        """
+        _, file, current_stat = item
+        if current_stat[1] >= MMAP_MIN_SIZE:
+            return None
         try:
-            content = file.read_text(encoding="utf-8").lower()
-            md = metadata_cache.get_metadata(file)
-            if query in content or query in str(md).lower():
-                results.append(file.stem)
+            data = file.read_bytes()
+            # ASCII can be lowercased as bytes; anything else needs str.lower().
+            if _NON_ASCII_RE.search(data) is None:
+                return data.lower()
+            return data.decode("utf-8").lower().encode("utf-8")
         except Exception as e:
-            logging.error(f"Error searching file {file}: {e}")
-    return sorted(results)
+            return e
 
-def filter_by_tag(tag: str):
-    matches = set()
-    for file in DIARY_DIR.glob("*.md"):
+    def _index_file(self, date_str: str, file: Path, current_stat, content_lc):
         md = metadata_cache.get_metadata(file)
-        if isinstance(md.get("tags", []), list) and tag in md.get("tags", []):
-            matches.add(file.stem)
-    return matches
+        self._drop(date_str)
+        self.file_stats[date_str] = current_stat
+        self.by_date[date_str] = md
+        if content_lc is None:
+            self.large_files[date_str] = file
+        else:
+            self.content_lc[date_str] = content_lc
+        self.metadata_lc[date_str] = metadata_search_text(md)
+        if content_lc is not None:
+            self._add_trigrams(date_str)
+        tags = md.get("tags", [])
+        if isinstance(tags, list):
+            # Snapshot the tags: the metadata dict is shared with metadata_cache
+            # and may be mutated in place before this entry is re-indexed.
+            self.file_tags[date_str] = {tag for tag in tags if isinstance(tag, str)}
+            for tag in self.file_tags[date_str]:
+                self.tags_inverted.setdefault(tag, set()).add(date_str)
+
+    def _indexed_text(self, date_str: str) -> bytes:
+        # Content and metadata are indexed together; a trigram spanning the
+        # separator can only add a candidate, which the confirm step rejects.
+        return self.content_lc[date_str] + b"\n" + self.metadata_lc[date_str].encode("utf-8")
+
+    def _add_trigrams(self, date_str: str):
+        trigrams = self.trigrams
+        get = trigrams.get
+        for trigram in byte_trigrams(self._indexed_text(date_str)):
+            postings = get(trigram)
+            if postings is None:
+                trigrams[trigram] = {date_str}
+            else:
+                postings.add(date_str)
+
+    def _remove_trigrams(self, date_str: str):
+        # The entry's old text is still indexed at this point, so its
+        # trigrams can be recomputed rather than stored per entry.
+        trigrams = self.trigrams
+        for trigram in byte_trigrams(self._indexed_text(date_str)):
+            postings = trigrams[trigram]
+            postings.discard(date_str)
+            if not postings:
+                del trigrams[trigram]
+
+    def _drop(self, date_str: str):
+        # Only entries mirrored in content_lc are in the trigram index.
+        if date_str in self.content_lc:
+            self._remove_trigrams(date_str)
+        self.file_stats.pop(date_str, None)
+        self.content_lc.pop(date_str, None)
+        self.large_files.pop(date_str, None)
+        self.metadata_lc.pop(date_str, None)
+        self.by_date.pop(date_str, None)
+        for tag in self.file_tags.pop(date_str, ()):
+            postings = self.tags_inverted.get(tag)
+            if postings is not None:
+                postings.discard(date_str)
+                if not postings:
+                    del self.tags_inverted[tag]
+
+    def _candidates(self, query_lc: bytes):
+        """Entries whose indexed text holds every trigram of query_lc."""
+        postings = []
+        for trigram in byte_trigrams(query_lc):
+            dates = self.trigrams.get(trigram)
+            if not dates:
+                return ()
+            postings.append(dates)
+        # Starting from the rarest trigram keeps every intersection small.
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, query: str):
+        with self.lock:
+            return self._search(query)
+
+    def _search(self, query: str):
+        query = query.lower()
+        query_lc = query.encode("utf-8")
+        if len(query_lc) >= 3:
+            candidates = self._candidates(query_lc)
+        else:
+            candidates = self.content_lc
+        results = [date_str for date_str in candidates
+                   if query_lc in self.content_lc[date_str] or query in self.metadata_lc[date_str]]
+        if self.large_files:
+            # Bytes-level IGNORECASE only folds ASCII. Other queries are first
+            # looked for verbatim in the mapped bytes (text containing the
+            # lowercased query still does once lowercased), and the file is
+            # only decoded when that misses.
+            try:
+                pattern = re.compile(re.escape(query.encode("ascii")), re.IGNORECASE)
+            except UnicodeEncodeError:
+                pattern = None
+            for date_str, file in self.large_files.items():
+                if query in self.metadata_lc[date_str]:
+                    results.append(date_str)
+                    continue
+                try:
+                    if pattern is not None:
+                        found = mmap_search(file, pattern)
+                    else:
+                        found = (mmap_find(file, query_lc)
+                                 or query in file.read_bytes().decode("utf-8").lower())
+                except (OSError, ValueError) as e:
+                    logging.error(f"Error searching file {file}: {e}")
+                    continue
+                if found:
+                    results.append(date_str)
+        return sorted(results)
+
+    def filter_by_tag(self, tag: str):
+        with self.lock:
+            return set(self.tags_inverted.get(tag, ()))
+
+diary_index = DiaryIndex(DIARY_DIR)
+
+def search_diary(query: str):
+    with diary_index.lock:
+        diary_index.refresh()
+        return diary_index.search(query)
+
+def filter_by_tag(tag: str):
+    with diary_index.lock:
+        diary_index.refresh()
+        return diary_index.filter_by_tag(tag)
+
+def warm_diary_index():
+    """Build the diary index ahead of the first search or tag filter."""
+    try:
+        diary_index.refresh()
+    except Exception as e:
+        logging.error(f"Diary index build failed: {e}")
+
+def start_diary_index_warmup():
+    thread = threading.Thread(target=warm_diary_index)
+    thread.daemon = True
+    thread.start()
+
+_LINK_RE = re.compile(r"\[\[([^]|]+)(?:\|([^\]]+))?\]\]")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\Z")
 
 def parse_links_from_text(text: str):
-    pattern = re.compile(r"\[\[([^]|]+)(?:\|([^\]]+))?\]\]")
-    return [(m.group(2).strip() if m.group(2) else m.group(1).strip(),
-             m.group(1).strip()) for m in pattern.finditer(text)]
+    # findall hands back (target, alias) tuples, with "" for a missing alias,
+    # without creating a match object per link.
+    return [((alias or target).strip(), target.strip()) for target, alias in _LINK_RE.findall(text)]
 
 def draw_rectangle(win, y1, x1, y2, x2):
     try:
@@ -868,6 +1657,10 @@ def draw_links_menu(stdscr, links):
         elif key in (27, ord('q')):
             return None
 
+# file_path -> ((st_mtime_ns, st_size), lines) for the task/note preview pane,
+# so the selected file is only re-read when it changes on disk.
+_file_preview_cache = {}
+
 def draw_preview(stdscr, lines, start_y, start_x, height, width, scroll):
     max_width = width - start_x - 2
     available = height - start_y - 2
@@ -889,6 +1682,11 @@ def draw_preview(stdscr, lines, start_y, start_x, height, width, scroll):
             pass
         line_num += 1
 
+# Idle input poll: short right after a key press, doubling up to the maximum
+# while the user is idle. Each empty poll only checks whether a redraw is due.
+IDLE_WAIT_MIN_MS = 10
+IDLE_WAIT_MAX_MS = 1000
+
 # ---------------------------------------------------------------------
 # DIARY TUI CLASS (with combined functionality including recurring tasks, contexts, and a new Notes view)
 # ---------------------------------------------------------------------
@@ -909,24 +1707,23 @@ class DiaryTUI:
         curses.init_pair(9, curses.COLOR_BLUE, -1)
         curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
         curses.mouseinterval(0)
-        self.cal = calendar.TextCalendar(calendar.SUNDAY)
         self.selected_date = datetime.now()
         self.current_view = "month"  # For drawing calendar: month/week/year
         # non_side_by_side_mode now can be "preview", "tasks", "timeblock", or "notes"
         self.non_side_by_side_mode = "preview"
         self.preview_scroll = 0
-        self.search_results = set()
+        # search_list keeps the match order for n/p; search_results is the same
+        # dates as a frozenset for the calendar's per-cell membership tests.
+        self.search_results = frozenset()
         self.tag_results = set()
         self.current_search_idx = -1
         self.search_list = []
-        self.nvim_path = shutil.which("nvim")
-        self.tmux_path = shutil.which("tmux")
-        self.fallback_editor = shutil.which("vi") or shutil.which("nano")
         self.task_filter = "all"
         self.context_filter = None
         self.task_manager = TaskManager(NOTES_DIR, INDEX_STATE_FILE)
         self.task_creator = TaskCreator(NOTES_DIR)
         self.tasks_list = []
+        self._task_decor = (None, [])  # (inputs, [(text, attr)] per task in tasks_list)
         self.notes_list = []  # List for the new Notes view
         self.selected_task_index = 0
         self.selected_note_index = 0  # Selection index for notes
@@ -939,11 +1736,53 @@ class DiaryTUI:
         self.preview_pane_focused = False
         self.calendar_height_non_side = 0
         self.calendar_height_side = 0
-        self.refresh_timer = None
         self.task_indexing_message = ""
+        # What the last frame showed, for deciding whether an idle poll redraws.
+        self._next_timeblock_boundary = datetime.now()
+        self._drawn_tasks = None
+        self._drawn_indexing = False
+        self._drawn_entry_key = None
+        self._frame_stale = False
+        self._preview_cache = {}  # date_str -> ((st_mtime_ns, st_size), (preview text, preview lines))
+        self._links_cache = {}  # date_str -> ((st_mtime_ns, st_size), [(display, target), ...])
+        # get_preview also runs on the prefetch workers.
+        self._preview_lock = threading.Lock()
+        self._help_pad = None  # ((popup height, popup width), pad) for show_help
+        self._tool_paths = {}  # (command names) -> first one found on PATH, or None
+        self.keymap = self.build_keymap()
+        # Workers that parse diary frontmatter ahead of the calendar views.
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=4)
+        self._prefetch_futures = []  # submitted jobs, so quitting can cancel the queued ones
+        self._prefetch_key = None
+        self._preview_prefetch_key = None
+        start_diary_index_warmup()
+
+    # Editor lookups scan PATH, so they wait until a file is first opened
+    # and each runs once.
+    def _tool_path(self, *names):
+        if names not in self._tool_paths:
+            found = None
+            for name in names:
+                found = shutil.which(name)
+                if found:
+                    break
+            self._tool_paths[names] = found
+        return self._tool_paths[names]
+
+    @property
+    def nvim_path(self):
+        return self._tool_path("nvim")
+
+    @property
+    def tmux_path(self):
+        return self._tool_path("tmux")
+
+    @property
+    def fallback_editor(self):
+        return self._tool_path("vi", "nano")
 
     # -----------------------------------------------------------------
-    # DYNAMIC REFRESH TIMING (Instead of fixed 60 seconds)
+    # DYNAMIC REFRESH TIMING (redraw at the next timeblock boundary)
     # -----------------------------------------------------------------
     def calculate_wait_time_until_next_timeblock(self):
         now = datetime.now()
@@ -954,30 +1793,37 @@ class DiaryTUI:
         wait_time = (next_boundary - now).total_seconds()
         return max(wait_time, 1)
 
-    def start_refresh_thread(self):
-        self.stop_refresh_thread()
-        wait_time = self.calculate_wait_time_until_next_timeblock()
-        self.refresh_timer = threading.Timer(wait_time, self.refresh_screen)
-        self.refresh_timer.daemon = True
-        self.refresh_timer.start()
-
-    def stop_refresh_thread(self):
-        if self.refresh_timer and self.refresh_timer.is_alive():
-            self.refresh_timer.cancel()
+    def idle_redraw_needed(self) -> bool:
+        """Whether anything on screen went stale while no key was pressed."""
+        if datetime.now() >= self._next_timeblock_boundary:
+            return True
+        if (self.task_manager.tasks_cache is not self._drawn_tasks
+                or self.task_manager.is_indexing != self._drawn_indexing):
+            return True
+        return preview_stat_key(self.selected_date_str()) != self._drawn_entry_key
 
     def refresh_screen(self):
         height, width = self.stdscr.getmaxyx()
+        # Formatted once per frame and handed to the panes that need it.
+        date_str = self.selected_date_str()
+        self._next_timeblock_boundary = datetime.now() + timedelta(
+            seconds=self.calculate_wait_time_until_next_timeblock())
+        self._drawn_tasks = self.task_manager.tasks_cache
+        self._drawn_indexing = self.task_manager.is_indexing
+        self._drawn_entry_key = preview_stat_key(date_str)
         if height >= 10 and width >= 60:
-            self.stdscr.clear()
+            # erase() only blanks the window; curses then sends the cells that
+            # differ from what is on the terminal, where clear() repainted all.
+            self.stdscr.erase()
+            # One listing of the diary directory serves the calendar and the
+            # prefetches of this frame.
+            diary_dates = existing_diary_dates()
             if self.is_side_by_side():
-                self.draw_side_by_side_layout(height, width)
+                self.draw_side_by_side_layout(height, width, diary_dates)
             else:
-                self.draw_layout(height, width)
+                self.draw_layout(height, width, diary_dates)
             self.draw_divider(height, width)
             # In non-side-by-side mode the diary preview is of the diary entry
-            date_str = self.selected_date.strftime("%Y-%m-%d")
-            preview_text = get_diary_preview(date_str)
-            lines = preview_text.splitlines()
             if self.is_side_by_side():
                 # When in split view, use the new flexible right panel.
                 if self.non_side_by_side_mode == "tasks":
@@ -987,75 +1833,169 @@ class DiaryTUI:
                     self.draw_notes_pane(height, width)
                     self.draw_file_preview(self.get_selected_note_file(), height, width)
                 elif self.non_side_by_side_mode == "timeblock":
-                    self.draw_timeblock_pane(height, width)
+                    self.draw_timeblock_pane(height, width, date_str)
                 else:  # "preview"
-                    self.draw_preview_pane(height, width, lines)
+                    self.draw_preview_pane(height, width, self.get_preview_lines(date_str))
             else:
                 if self.non_side_by_side_mode == "preview":
-                    self.draw_preview_pane_full(height, width, lines)
+                    self.draw_preview_pane_full(height, width, self.get_preview_lines(date_str))
                 elif self.non_side_by_side_mode == "tasks":
                     self.draw_tasks_pane_full(height, width)
                 elif self.non_side_by_side_mode == "timeblock":
-                    self.draw_timeblock_pane_full(height, width)
+                    self.draw_timeblock_pane_full(height, width, date_str)
                 elif self.non_side_by_side_mode == "notes":
                     self.draw_notes_pane_full(height, width)
             self.display_status_bar(height, width)
             self.display_footer(height, width)
             self.stdscr.refresh()
-        self.start_refresh_thread()
+            self.prefetch_calendar_metadata(diary_dates)
+            if self.non_side_by_side_mode == "preview":
+                self.prefetch_previews(date_str, diary_dates)
+
+    def prefetch_calendar_metadata(self, diary_dates):
+        """
+        Parse the diary entries of the selected year and of the neighbouring
+        months on worker threads, so that moving to another month or to the
+        year view finds them in metadata_cache instead of reading them on the
+        drawing thread.
+        """
+        year, month = self.selected_date.year, self.selected_date.month
+        if self._prefetch_key == (year, month):
+            return
+        self._prefetch_key = (year, month)
+        prev_year, prev_month = (year, month - 1) if month > 1 else (year - 1, 12)
+        next_year, next_month = (year, month + 1) if month < 12 else (year + 1, 1)
+        prefixes = (f"{year}-", f"{prev_year}-{prev_month:02}-", f"{next_year}-{next_month:02}-")
+        for date_str in diary_dates:
+            if date_str.startswith(prefixes):
+                file_path = DIARY_DIR / f"{date_str}.md"
+                if not metadata_cache.is_cached(file_path):
+                    self.submit_prefetch(metadata_cache.get_metadata, file_path)
+
+    def prefetch_previews(self, date_str: str, diary_dates):
+        """
+        Read the entries one day and one week either side of the selected day
+        into the preview cache on the prefetch workers, so stepping there with
+        the arrow keys finds the preview already read and split.
+        """
+        if self._preview_prefetch_key == date_str:
+            return
+        self._preview_prefetch_key = date_str
+        day = self.selected_date.date()
+        for offset in (1, -1, 7, -7):
+            near = day + timedelta(days=offset)
+            near_str = date_key(near.year, near.month, near.day)
+            if near_str in diary_dates:
+                with self._preview_lock:
+                    if near_str in self._preview_cache:
+                        continue
+                self.submit_prefetch(self.get_preview, near_str)
+
+    def submit_prefetch(self, fn, *args):
+        if len(self._prefetch_futures) >= 64:
+            self._prefetch_futures = [f for f in self._prefetch_futures if not f.done()]
+        self._prefetch_futures.append(self.prefetch_executor.submit(fn, *args))
+
+    def get_preview(self, date_str: str):
+        """
+        (text, lines) of the diary preview for date_str, re-read and split
+        only when the file changes. Panes that do not show the entry never
+        call this, so a large entry is not touched while they are open.
+        """
+        stat_key = preview_stat_key(date_str)
+        with self._preview_lock:
+            cached = self._preview_cache.get(date_str)
+        if cached and cached[0] == stat_key:
+            return cached[1]
+        text = get_diary_preview(date_str)
+        preview = (text, text.splitlines())
+        with self._preview_lock:
+            self._preview_cache[date_str] = (stat_key, preview)
+        return preview
+
+    def get_preview_lines(self, date_str: str):
+        return self.get_preview(date_str)[1]
+
+    def get_links(self, date_str: str):
+        # Keyed like _preview_cache, so reopening the links menu on an
+        # unchanged entry does not run the link regex over it again.
+        stat_key = preview_stat_key(date_str)
+        cached = self._links_cache.get(date_str)
+        if cached and cached[0] == stat_key:
+            return cached[1]
+        links = parse_links_from_text(self.get_preview(date_str)[0])
+        self._links_cache[date_str] = (stat_key, links)
+        return links
 
     def is_side_by_side(self) -> bool:
         # For our purposes, if the terminal width is above a certain threshold, we use side-by-side mode.
-        height, width = self.stdscr.getmaxyx()
-        return width >= 120
-
-    def run(self):
-        self.start_refresh_thread()
-        while True:
-            self.stdscr.clear()
-            height, width = self.stdscr.getmaxyx()
-            if height < 10 or width < 60:
-                self.display_minimum_size_warning(height, width)
-                if self.stdscr.getch() == ord('q'):
-                    break
-                continue
-            if self.is_side_by_side():
-                self.draw_side_by_side_layout(height, width)
-            else:
-                self.draw_layout(height, width)
-            self.draw_divider(height, width)
-            date_str = self.selected_date.strftime("%Y-%m-%d")
-            preview_text = get_diary_preview(date_str)
-            lines = preview_text.splitlines()
-            if self.is_side_by_side():
-                if self.non_side_by_side_mode == "tasks":
-                    self.draw_tasks_pane(height, width)
-                    self.draw_file_preview(self.get_selected_task_file(), height, width)
-                elif self.non_side_by_side_mode == "notes":
-                    self.draw_notes_pane(height, width)
-                    self.draw_file_preview(self.get_selected_note_file(), height, width)
-                elif self.non_side_by_side_mode == "timeblock":
-                    self.draw_timeblock_pane(height, width)
-                else:
-                    self.draw_preview_pane(height, width, lines)
-            else:
-                if self.non_side_by_side_mode == "preview":
-                    self.draw_preview_pane_full(height, width, lines)
-                elif self.non_side_by_side_mode == "tasks":
-                    self.draw_tasks_pane_full(height, width)
-                elif self.non_side_by_side_mode == "timeblock":
-                    self.draw_timeblock_pane_full(height, width)
-                elif self.non_side_by_side_mode == "notes":
-                    self.draw_notes_pane_full(height, width)
-            self.display_status_bar(height, width)
-            self.display_footer(height, width)
-            self.stdscr.refresh()
+        height, width = self.stdscr.getmaxyx()
+        return width >= 120
+
+    def run(self):
+        # All drawing happens on this thread. Between key presses getch()
+        # times out and the screen is only redrawn if idle_redraw_needed().
+        redraw = True
+        idle_wait_ms = IDLE_WAIT_MIN_MS
+        while True:
+            height, width = self.stdscr.getmaxyx()
+            too_small = height < 10 or width < 60
+            if redraw:
+                if too_small:
+                    self.stdscr.erase()
+                    self.display_minimum_size_warning(height, width)
+                else:
+                    self.refresh_screen()
+            self.stdscr.timeout(idle_wait_ms)
             key = self.stdscr.getch()
-            if key == 16:  # Ctrl+P: command palette
-                self.show_command_palette(height, width)
-            elif not self.handle_input(key, height, width):
+            # Prompts and popups further down expect blocking reads.
+            self.stdscr.timeout(-1)
+            if key == -1:
+                idle_wait_ms = min(idle_wait_ms * 2, IDLE_WAIT_MAX_MS)
+                self.task_manager.rescan_if_stale()
+                redraw = not too_small and self.idle_redraw_needed()
+                continue
+            idle_wait_ms = IDLE_WAIT_MIN_MS
+            if too_small:
+                redraw = True
+                if key == ord('q'):
+                    break
+                continue
+            # Keys without a binding (stray escapes) and mouse reports that
+            # change nothing (moves, releases) leave the frame as drawn;
+            # dispatch_key marks it stale when something is handled.
+            self._frame_stale = False
+            keep_running = self.dispatch_key(key, height, width)
+            # Drain keys that are already queued (e.g. held-down scroll or
+            # movement keys) before drawing, so a burst costs one redraw.
+            while keep_running:
+                self.stdscr.timeout(0)
+                key = self.stdscr.getch()
+                self.stdscr.timeout(-1)
+                if key == -1:
+                    break
+                height, width = self.stdscr.getmaxyx()
+                keep_running = self.dispatch_key(key, height, width)
+            if not keep_running:
                 break
-        self.stop_refresh_thread()
+            redraw = self._frame_stale
+        # Executor.shutdown() only takes cancel_futures from Python 3.9, so
+        # the queued prefetches are cancelled one by one.
+        for future in self._prefetch_futures:
+            future.cancel()
+        self.prefetch_executor.shutdown(wait=False)
+
+    def dispatch_key(self, key, height, width) -> bool:
+        if key == curses.KEY_MOUSE:
+            if self.handle_mouse():
+                self._frame_stale = True
+            return True
+        if key == 16 or key in self.keymap:
+            self._frame_stale = True
+        if key == 16:  # Ctrl+P: command palette
+            self.show_command_palette(height, width)
+            return True
+        return self.handle_input(key, height, width)
 
     def display_minimum_size_warning(self, height, width):
         warning = "Terminal too small. Resize or press 'q' to quit."
@@ -1086,7 +2026,7 @@ class DiaryTUI:
                 focus = "Timeblock"
             else:
                 focus = "Preview"
-        status_text = (f" Date: {self.selected_date.strftime('%Y-%m-%d')} | "
+        status_text = (f" Date: {self.selected_date_str()} | "
                        f"Pomodoros: {stats['total_pomodoros']} | "
                        f"Workouts: {stats['total_workouts']} | Meditated: {stats['days_meditated']} | "
                        f"Focus: {focus} | View: {self.current_view} ")
@@ -1117,48 +2057,48 @@ class DiaryTUI:
             except curses.error:
                 pass
 
-    def draw_layout(self, height, width):
+    def draw_layout(self, height, width, diary_dates):
         start_x, start_y = 2, 2
         if self.current_view == "month":
-            draw_single_month(self.stdscr, self.cal, self.selected_date.year, self.selected_date.month,
+            draw_single_month(self.stdscr, self.selected_date.year, self.selected_date.month,
                               start_x, start_y,
                               highlight=(self.selected_date.year, self.selected_date.month, self.selected_date.day),
                               search_results=self.search_results, tag_results=self.tag_results,
-                              task_manager=self.task_manager, current_date=self.selected_date)
+                              task_manager=self.task_manager, current_date=self.selected_date, diary_dates=diary_dates)
             self.calendar_height_non_side = 8
         elif self.current_view == "week":
-            draw_week_view(self.stdscr, self.cal, self.selected_date,
+            draw_week_view(self.stdscr, self.selected_date,
                            start_x, start_y, search_results=self.search_results, tag_results=self.tag_results,
-                           task_manager=self.task_manager, current_date=self.selected_date)
+                           task_manager=self.task_manager, current_date=self.selected_date, diary_dates=diary_dates)
             self.calendar_height_non_side = 6
         else:
-            draw_year_view(self.stdscr, self.cal, self.selected_date.year,
+            draw_year_view(self.stdscr, self.selected_date.year,
                            start_x, start_y,
                            highlight=(self.selected_date.year, self.selected_date.month, self.selected_date.day),
                            search_results=self.search_results, tag_results=self.tag_results,
-                           task_manager=self.task_manager, current_date=self.selected_date)
+                           task_manager=self.task_manager, current_date=self.selected_date, diary_dates=diary_dates)
             self.calendar_height_non_side = 39
 
-    def draw_side_by_side_layout(self, height, width):
+    def draw_side_by_side_layout(self, height, width, diary_dates):
         cal_width = width // 2 - 4
         if self.current_view == "month":
-            draw_single_month(self.stdscr, self.cal, self.selected_date.year, self.selected_date.month,
+            draw_single_month(self.stdscr, self.selected_date.year, self.selected_date.month,
                               2, 2,
                               highlight=(self.selected_date.year, self.selected_date.month, self.selected_date.day),
                               search_results=self.search_results, tag_results=self.tag_results,
-                              task_manager=self.task_manager, current_date=self.selected_date)
+                              task_manager=self.task_manager, current_date=self.selected_date, diary_dates=diary_dates)
             self.calendar_height_side = 8
         elif self.current_view == "week":
-            draw_week_view(self.stdscr, self.cal, self.selected_date,
+            draw_week_view(self.stdscr, self.selected_date,
                            2, 2, search_results=self.search_results, tag_results=self.tag_results,
-                           task_manager=self.task_manager, current_date=self.selected_date)
+                           task_manager=self.task_manager, current_date=self.selected_date, diary_dates=diary_dates)
             self.calendar_height_side = 6
         else:
-            draw_year_view(self.stdscr, self.cal, self.selected_date.year,
+            draw_year_view(self.stdscr, self.selected_date.year,
                            2, 2,
                            highlight=(self.selected_date.year, self.selected_date.month, self.selected_date.day),
                            search_results=self.search_results, tag_results=self.tag_results,
-                           task_manager=self.task_manager, current_date=self.selected_date)
+                           task_manager=self.task_manager, current_date=self.selected_date, diary_dates=diary_dates)
             self.calendar_height_side = 39
 
     def draw_preview_pane(self, height, width, lines):
@@ -1223,7 +2163,7 @@ class DiaryTUI:
         import datetime
 
         self.notes_list = []
-        selected_str = self.selected_date.strftime("%Y-%m-%d")
+        selected_str = self.selected_date_str()
         for file in NOTES_DIR.glob("*.md"):
             md = metadata_cache.get_note_metadata(file)
             # Exclude files that are tasks (i.e. contain the tag "task")
@@ -1369,9 +2309,6 @@ class DiaryTUI:
             except curses.error:
                 pass
 
-    def read_tasks_cache(self):
-        self.tasks_list = self.task_manager.filter_tasks(self.task_filter, self.selected_date, self.context_filter)
-
     def display_error(self, msg):
         height, width = self.stdscr.getmaxyx()
         try:
@@ -1381,18 +2318,20 @@ class DiaryTUI:
         self.stdscr.refresh()
         time.sleep(1)
 
-    def draw_tasks_pane(self, height, width):
-        tasks_y = self.calendar_height_side + 4
-        tasks_x = 2
-        available_height = height - tasks_y - 1
-        available_width = (width // 2) - 4
-        self.read_tasks_cache()
-        if self.task_manager.is_indexing:
-            self.task_indexing_message = "Indexing tasks..."
-        else:
-            self.task_indexing_message = ""
-
-        for idx, task in enumerate(self.tasks_list[self.preview_scroll:self.preview_scroll + available_height]):
+    def task_decorations(self, archived_attr):
+        """
+        (line, attr) for every task in tasks_list, as drawn when not selected.
+        Rebuilt only when the task list, the selected day or today changes,
+        so scrolling and moving the selection reuse it.
+        """
+        today_ord = datetime.today().toordinal()
+        selected_ord = self.selected_date.toordinal()
+        key = (self.tasks_list, selected_ord, today_ord, archived_attr)
+        cached_key, decorations = self._task_decor
+        if cached_key is not None and cached_key[0] is key[0] and cached_key[1:] == key[1:]:
+            return decorations
+        decorations = []
+        for task in self.tasks_list:
             prefix = "[*]" if task.get("recurrence") else ""
             effective_status = self.task_manager.get_effective_status(task, self.selected_date)
             mark = "[x]" if effective_status == "done" else ("[~]" if effective_status == "in-progress" else "[ ]")
@@ -1400,10 +2339,9 @@ class DiaryTUI:
             due = task.get("due", "")
             priority = task.get("priority", "normal")
             contexts = task.get("contexts", [])
-            is_archived = isinstance(task.get("tags"), list) and "archive" in task.get("tags")
             attr = curses.A_NORMAL
-            if is_archived:
-                attr |= curses.color_pair(8)
+            if "archive" in task.get("_tags_set", _EMPTY_SET):
+                attr |= archived_attr
             if priority == "high":
                 attr |= curses.color_pair(5)
             elif priority == "low":
@@ -1413,156 +2351,69 @@ class DiaryTUI:
                 attr |= curses.color_pair(6)
             if effective_status == "in-progress":
                 attr = curses.color_pair(1)
-            if due:
-                try:
-                    due_date = datetime.strptime(due, "%Y-%m-%d")
-                    if due_date < datetime.today() and effective_status != "done":
-                        attr |= curses.A_BOLD
-                        prefix = " !!!"
-                    if due_date.date() == self.selected_date.date():
-                        attr |= curses.A_BOLD
-                except Exception:
-                    pass
-            line = f"- {mark}{prefix} {title}"
-            if self.task_pane_focused and (idx + self.preview_scroll) == self.selected_task_index:
-                attr = curses.A_REVERSE
-                attr = curses.color_pair(3) | curses.A_BOLD
-                line = f"> - {mark}{prefix} {title}"
-            if due:
-                line += f" (Due: {due})"
-            if contexts:
-                line += f" ({', '.join(contexts)})"
-            if task.get("recurrence"):
-                if effective_status != "done":
-                    if self.selected_date.date() == datetime.today().date():
-                        attr |= curses.A_BOLD
-            try:
-                self.stdscr.addnstr(tasks_y + idx, tasks_x, line, available_width, attr)
-            except curses.error:
-                pass
+            due_ord = task.get("_due_ordinal") if due else None
+            if due_ord is not None:
+                # Due today already counts as past once the day has begun.
+                if due_ord <= today_ord and effective_status != "done":
+                    attr |= curses.A_BOLD
+                    prefix = " !!!"
+                if due_ord == selected_ord:
+                    attr |= curses.A_BOLD
+            if task.get("recurrence") and effective_status != "done" and selected_ord == today_ord:
+                attr |= curses.A_BOLD
+            due_part = f" (Due: {due})" if due else ""
+            contexts_part = f" ({', '.join(contexts)})" if contexts else ""
+            decorations.append((f"- {mark}{prefix} {title}{due_part}{contexts_part}", attr))
+        self._task_decor = (key, decorations)
+        return decorations
+
+    def draw_tasks_pane(self, height, width):
+        tasks_y = self.calendar_height_side + 4
+        self._render_tasks(tasks_y, 2, height - tasks_y - 1, (width // 2) - 4, curses.color_pair(8))
 
     def draw_tasks_pane_full(self, height, width):
         tasks_y = self.calendar_height_non_side + 4
-        tasks_x = 2
-        available_height = height - tasks_y - 3
-        available_width = width - 4
+        self._render_tasks(tasks_y, 2, height - tasks_y - 3, width - 4, curses.A_DIM)
+
+    def _render_tasks(self, tasks_y, tasks_x, available_height, available_width, archived_attr):
+        """Shared body of the task panes; callers only supply the geometry."""
         self.read_tasks_cache()
         if self.task_manager.is_indexing:
             self.task_indexing_message = "Indexing tasks..."
         else:
             self.task_indexing_message = ""
-        for idx, task in enumerate(self.tasks_list[self.preview_scroll:self.preview_scroll + available_height]):
-            prefix = "[*]" if task.get("recurrence") else ""
-            effective_status = self.task_manager.get_effective_status(task, self.selected_date)
-            mark = "[x]" if effective_status == "done" else ("[~]" if effective_status == "in-progress" else "[ ]")
-            title = task.get("title", "Untitled")
-            due = task.get("due", "")
-            priority = task.get("priority", "normal")
-            contexts = task.get("contexts", [])
-            is_archived = isinstance(task.get("tags"), list) and "archive" in task.get("tags")
-            attr = curses.A_NORMAL
-            if is_archived:
-                attr |= curses.A_DIM
-            if priority == "high":
-                attr |= curses.color_pair(5)
-            elif priority == "low":
-                attr |= curses.color_pair(3)
-                attr |= curses.A_DIM
-            else:
-                attr |= curses.color_pair(6)
-            if effective_status == "in-progress":
-                attr = curses.color_pair(1)
-            if due:
-                try:
-                    due_date = datetime.strptime(due, "%Y-%m-%d")
-                    if due_date < datetime.today() and effective_status != "done":
-                        attr |= curses.A_BOLD
-                        prefix = " !!!"
-                    if due_date.date() == self.selected_date.date():
-                        attr |= curses.A_BOLD
-                except Exception:
-                    pass
-            line = f"- {mark}{prefix} {title}"
-            if self.task_pane_focused and (idx + self.preview_scroll) == self.selected_task_index:
-                attr = curses.A_REVERSE
+        decorations = self.task_decorations(archived_attr)
+        start = self.preview_scroll
+        for idx, (line, attr) in enumerate(decorations[start:start + available_height]):
+            if self.task_pane_focused and idx + start == self.selected_task_index:
+                line = "> " + line
                 attr = curses.color_pair(3) | curses.A_BOLD
-                line = f"> - {mark}{prefix} {title}"
-            if due:
-                line += f" (Due: {due})"
-            if contexts:
-                line += f" ({', '.join(contexts)})"
-            if task.get("recurrence"):
-                if effective_status != "done":
-                    if self.selected_date.date() == datetime.today().date():
-                        attr |= curses.A_BOLD
             try:
                 self.stdscr.addnstr(tasks_y + idx, tasks_x, line, available_width, attr)
             except curses.error:
                 pass
 
-    def draw_timeblock_pane(self, height, width):
+    def draw_timeblock_pane(self, height, width, date_str):
         tb_y = self.calendar_height_side + 3
-        tb_x = 2
-        available_height = height - tb_y - 1
-        available_width = (width // 2) - 4
-        date_str = self.selected_date.strftime("%Y-%m-%d")
-        file_path = DIARY_DIR / f"{date_str}.md"
-        tb_entries = timeblock_cache.get_timeblock(file_path)
-        table = ["", "  Time  | Activity  "]
-        for t, act in tb_entries:
-            table.append(f"  {t} | {act} ")
-        now = datetime.now()
-        for idx, line in enumerate(table[self.preview_scroll:self.preview_scroll + available_height]):
-            attr = curses.A_NORMAL
-            if idx > 1:
-                try:
-                    t_str = table[idx + self.preview_scroll].split('|')[0].strip()
-                    block_hour, block_min = map(int, t_str.split(":"))
-                    end_hour, end_min = block_hour, block_min + 30
-                    if end_min >= 60:
-                        end_min -= 60
-                        end_hour += 1
-                    if ((now.hour > block_hour) or (now.hour == block_hour and now.minute >= block_min)) and \
-                       ((now.hour < end_hour) or (now.hour == end_hour and now.minute < end_min)):
-                        attr = curses.color_pair(2) | curses.A_BOLD
-                    elif (self.timeblock_pane_focused and (idx + self.preview_scroll - 2) == self.selected_timeblock_index):
-                        attr = curses.color_pair(3) | curses.A_BOLD
-                except Exception:
-                    pass
-            try:
-                self.stdscr.addnstr(tb_y + idx, tb_x, line, available_width, attr)
-            except curses.error:
-                pass
+        self._render_timeblock(date_str, tb_y, 2, height - tb_y - 1, (width // 2) - 4)
 
-    def draw_timeblock_pane_full(self, height, width):
+    def draw_timeblock_pane_full(self, height, width, date_str):
         tb_y = self.calendar_height_non_side + 3
-        tb_x = 2
-        available_height = height - tb_y - 3
-        available_width = width - 4
-        date_str = self.selected_date.strftime("%Y-%m-%d")
+        self._render_timeblock(date_str, tb_y, 2, height - tb_y - 3, width - 4)
+
+    def _render_timeblock(self, date_str, tb_y, tb_x, available_height, available_width):
+        """Shared body of the timeblock panes; callers only supply the geometry."""
         file_path = DIARY_DIR / f"{date_str}.md"
-        tb_entries = timeblock_cache.get_timeblock(file_path)
-        table = ["", "  Time  | Activity  "]
-        for t, act in tb_entries:
-            table.append(f"  {t} | {act} ")
-        now = datetime.now()
+        block_starts, table = timeblock_cache.get_table(file_path)
+        active_idx = current_timeblock_index(block_starts, datetime.now())
         for idx, line in enumerate(table[self.preview_scroll:self.preview_scroll + available_height]):
             attr = curses.A_NORMAL
-            if idx > 1:
-                try:
-                    t_str = table[idx + self.preview_scroll].split('|')[0].strip()
-                    block_hour, block_min = map(int, t_str.split(":"))
-                    end_hour, end_min = block_hour, block_min + 30
-                    if end_min >= 60:
-                        end_min -= 60
-                        end_hour += 1
-                    if ((now.hour > block_hour) or (now.hour == block_hour and now.minute >= block_min)) and \
-                       ((now.hour < end_hour) or (now.hour == end_hour and now.minute < end_min)):
-                        attr = curses.color_pair(2) | curses.A_BOLD
-                    elif (self.timeblock_pane_focused and (idx + self.preview_scroll - 2) == self.selected_timeblock_index):
-                        attr = curses.color_pair(3) | curses.A_BOLD
-                except Exception:
-                    pass
+            entry_idx = idx + self.preview_scroll - 2
+            if entry_idx >= 0:
+                if entry_idx == active_idx:
+                    attr = curses.color_pair(2) | curses.A_BOLD
+                elif self.timeblock_pane_focused and entry_idx == self.selected_timeblock_index:
+                    attr = curses.color_pair(3) | curses.A_BOLD
             try:
                 self.stdscr.addnstr(tb_y + idx, tb_x, line, available_width, attr)
             except curses.error:
@@ -1570,13 +2421,22 @@ class DiaryTUI:
 
     # A helper to open/read a file for preview – used for tasks and notes modes.
     def draw_file_preview(self, file_path: Path, height, width):
-        if not file_path or not file_path.exists():
+        if not file_path:
             return
         try:
-            content = file_path.read_text(encoding="utf-8")
-        except Exception as e:
-            content = f"Error reading file: {e}"
-        lines = content.splitlines()
+            st = file_path.stat()
+        except OSError:
+            return
+        current_stat = (st.st_mtime_ns, st.st_size)
+        cached = _file_preview_cache.get(file_path)
+        if cached and cached[0] == current_stat:
+            lines = cached[1]
+        else:
+            try:
+                lines = file_path.read_text(encoding="utf-8").splitlines()
+                _file_preview_cache[file_path] = (current_stat, lines)
+            except Exception as e:
+                lines = [f"Error reading file: {e}"]
         # Decide preview pane coordinates: right half of screen in side-by-side mode.
         pane_y = 2
         pane_x = (width // 2) + 2
@@ -1588,21 +2448,15 @@ class DiaryTUI:
         if not self.tasks_list:
             return None
         if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    return file
+            return self.resolve_task_file(self.tasks_list[self.selected_task_index])
         return None
 
     def display_footer(self, height, width):
         footer = "Press '?' for help."
         if self.search_results:
             footer = f"Search: {len(self.search_results)} matches. Use n/p to navigate, / for new search, f to filter, m/w/y/4 to switch view."
-        try:
-            self.stdscr.addnstr(height - 1, max(0, width - len(footer) - 2), footer, len(footer))
-        except curses.error:
-            pass
+        clipped_addnstr(self.stdscr, height - 1, max(0, width - len(footer) - 2), footer, len(footer),
+                        curses.A_NORMAL, height, width)
 
     def open_file_in_editor(self, file_path: Path):
         editor = self.nvim_path or self.fallback_editor
@@ -1629,6 +2483,9 @@ class DiaryTUI:
         return None
 
     def read_tasks_cache(self):
+        # filter_tasks hands back the list it built last time while the filter,
+        # the day and the task index are unchanged, so calling this from every
+        # draw and task action is cheap.
         self.tasks_list = self.task_manager.filter_tasks(self.task_filter, self.selected_date, self.context_filter)
 
     def display_error(self, msg):
@@ -1640,132 +2497,141 @@ class DiaryTUI:
         self.stdscr.refresh()
         time.sleep(1)
 
+    def build_keymap(self) -> dict:
+        """Key code -> handler(height, width) for everything but 'q'."""
+        diary_file = self.selected_diary_file
+        date_str = self.selected_date_str
+        keymap = {
+            # The terminal's contents are unknown after a resize.
+            curses.KEY_RESIZE: lambda h, w: self.stdscr.clearok(True),
+            ord('s'): self.show_month_stats,
+            ord('O'): lambda h, w: self.cycle_side_by_side_mode(),
+            ord('4'): lambda h, w: self.set_view_mode("notes"),
+            ord('i'): lambda h, w: setattr(self.task_manager, "dirty", True),
+            ord('/'): self.perform_search,
+            ord('n'): lambda h, w: self.navigate_search(1),
+            ord('p'): lambda h, w: self.navigate_search(-1),
+            ord('f'): self.perform_tag_filter,
+            ord('c'): self.perform_context_filter,
+            ord('e'): lambda h, w: self.edit_entry(diary_file()),
+            ord('a'): lambda h, w: self.add_note(diary_file(), date_str()),
+            ord('C'): lambda h, w: self.create_new_task(),
+            ord('T'): lambda h, w: add_default_timeblock(diary_file()),
+            ord('t'): lambda h, w: self.jump_to_today(),
+            ord('L'): lambda h, w: self.list_links(h, w, diary_file()),
+            ord('?'): self.show_help,
+            ord('1'): lambda h, w: self.set_view_mode("timeblock"),
+            ord('2'): lambda h, w: self.set_view_mode("tasks"),
+            ord('3'): lambda h, w: self.set_view_mode("preview"),
+            ord('o'): lambda h, w: self.task_pane_focused and self.open_selected_task(),
+            ord('R'): lambda h, w: self.non_side_by_side_mode == "tasks" and self.cycle_task_filter(),
+            ord('x'): lambda h, w: self.task_pane_focused and self.delete_selected_task(),
+            ord('z'): lambda h, w: self.task_pane_focused and self.cycle_selected_task_priority(),
+            ord('A'): lambda h, w: self.task_pane_focused and self.toggle_archive_selected_task(),
+        }
+        for k in (ord('m'), ord('w'), ord('y')):
+            keymap[k] = lambda h, w, view={"m": "month", "w": "week", "y": "year"}[chr(k)]: self.set_calendar_view(view)
+        for k in (ord('h'), curses.KEY_LEFT):
+            keymap[k] = lambda h, w: self.move_day(-1)
+        for k in (ord('l'), curses.KEY_RIGHT):
+            keymap[k] = lambda h, w: self.move_day(1)
+        for k in (ord('j'), curses.KEY_DOWN):
+            keymap[k] = lambda h, w: self.move_selection(1)
+        for k in (ord('k'), curses.KEY_UP):
+            keymap[k] = lambda h, w: self.move_selection(-1)
+        for k in (ord('M'), ord('W'), ord('P'), ord('I')):
+            keymap[k] = lambda h, w, k=k: self.toggle_metadata(k, diary_file())
+        for k in (ord('u'), ord('d'), ord('U'), ord('D')):
+            keymap[k] = lambda h, w, k=k: self.scroll_preview(k)
+        for k in (ord('0'), 9):
+            keymap[k] = lambda h, w: self.toggle_focus()
+        for k in (10, 13):
+            keymap[k] = lambda h, w: self.activate_selection()
+        return keymap
+
     def handle_input(self, key, height, width) -> bool:
         if key == ord('q'):
             return False
-        elif key == curses.KEY_RESIZE:
-            return True
-        elif key == curses.KEY_MOUSE:
-            self.handle_mouse()
-        elif key == ord('s'):
-            self.show_month_stats(height, width)
-        elif key in (ord('m'), ord('w'), ord('y')):
-            self.current_view = {"m": "month", "w": "week", "y": "year"}[chr(key)]
-            self.preview_scroll = 0
-        # Toggle side-by-side layout with O; in our case we still support side-by-side if width allows.
-        elif key == ord('O'):
-            # Toggle non_side_by_side_mode between tasks, time block, preview, notes cyclically if in side-by-side view
-            modes = ["preview", "tasks", "timeblock", "notes"]
-            current = modes.index(self.non_side_by_side_mode) if self.non_side_by_side_mode in modes else 0
-            self.non_side_by_side_mode = modes[(current + 1) % len(modes)]
-            # Reset focus flags based on mode:
-            self.task_pane_focused = (self.non_side_by_side_mode == "tasks")
-            self.timeblock_pane_focused = (self.non_side_by_side_mode == "timeblock")
-            self.note_pane_focused = (self.non_side_by_side_mode == "notes")
-            self.preview_scroll = 0
-        elif key == ord('4'):
-            self.non_side_by_side_mode = "notes"
+        handler = self.keymap.get(key)
+        if handler:
+            handler(height, width)
+        return True
+
+    def selected_date_str(self) -> str:
+        # date_key memoizes the formatting; strftime re-parses its format each call.
+        d = self.selected_date
+        return date_key(d.year, d.month, d.day)
+
+    def selected_diary_file(self) -> Path:
+        return DIARY_DIR / f"{self.selected_date_str()}.md"
+
+    def set_calendar_view(self, view: str):
+        self.current_view = view
+        self.preview_scroll = 0
+
+    def cycle_side_by_side_mode(self):
+        # Toggle non_side_by_side_mode between tasks, time block, preview, notes cyclically if in side-by-side view
+        modes = ["preview", "tasks", "timeblock", "notes"]
+        current = modes.index(self.non_side_by_side_mode) if self.non_side_by_side_mode in modes else 0
+        self.non_side_by_side_mode = modes[(current + 1) % len(modes)]
+        # Reset focus flags based on mode:
+        self.task_pane_focused = (self.non_side_by_side_mode == "tasks")
+        self.timeblock_pane_focused = (self.non_side_by_side_mode == "timeblock")
+        self.note_pane_focused = (self.non_side_by_side_mode == "notes")
+        self.preview_scroll = 0
+
+    def set_view_mode(self, mode: str):
+        # Keys 1-4: each mode sets exactly the flags its key always has.
+        self.non_side_by_side_mode = mode
+        if mode == "notes":
             self.note_pane_focused = True
             self.task_pane_focused = False
             self.timeblock_pane_focused = False
             self.preview_scroll = 0
-        elif key == ord('i'):
-            self.task_manager.dirty = True
-        elif key in (ord('h'), curses.KEY_LEFT):
-            self.move_day(-1)
-        elif key in (ord('l'), curses.KEY_RIGHT):
-            self.move_day(1)
-        elif key in (ord('j'), curses.KEY_DOWN):
-            if self.task_pane_focused:
-                self.move_task_selection(1)
-            elif self.note_pane_focused:
-                self.move_note_selection(1)
-            elif self.timeblock_pane_focused:
-                self.move_timeblock_selection(1)
-            else:
-                self.move_week(1)
-        elif key in (ord('k'), curses.KEY_UP):
-            if self.task_pane_focused:
-                self.move_task_selection(-1)
-            elif self.note_pane_focused:
-                self.move_note_selection(-1)
-            elif self.timeblock_pane_focused:
-                self.move_timeblock_selection(-1)
-            else:
-                self.move_week(-1)
-        elif key == ord('/'):
-            self.perform_search(height, width)
-        elif key == ord('n'):
-            self.navigate_search(1)
-        elif key == ord('p'):
-            self.navigate_search(-1)
-        elif key == ord('f'):
-            self.perform_tag_filter(height, width)
-        elif key == ord('c'):
-            self.perform_context_filter(height, width)
-        elif key == ord('e'):
-            self.edit_entry(DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md")
-        elif key == ord('a'):
-            self.add_note(DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md", self.selected_date.strftime("%Y-%m-%d"))
-        elif key == ord('C'):
-            self.create_new_task()
-        elif key == ord('T'):
-            add_default_timeblock(DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md")
-        elif key == ord('t'):
-            self.jump_to_today()
-        elif key in (ord('M'), ord('W'), ord('P'), ord('I')):
-            self.toggle_metadata(key, DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md")
-        elif key == ord('L'):
-            self.list_links(height, width, DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md")
-        elif key == ord('?'):
-            self.show_help(height, width)
-        elif key in (ord('u'), ord('d'), ord('U'), ord('D')):
-            self.scroll_preview(key)
-        elif key in (ord('0'), 9):
-            self.toggle_focus()
-        elif key == ord('1'):
-            self.non_side_by_side_mode = "timeblock"
+        elif mode == "timeblock":
             self.show_tasks = False
             self.task_pane_focused = False
             self.timeblock_pane_focused = True
-        elif key == ord('2'):
-            self.non_side_by_side_mode = "tasks"
+        elif mode == "tasks":
             self.show_tasks = True
             self.task_pane_focused = True
             self.timeblock_pane_focused = False
-        elif key == ord('3'):
-            self.non_side_by_side_mode = "preview"
-        elif key in (10, 13):
-            if self.task_pane_focused:
-                self.toggle_task()
-            elif self.note_pane_focused:
-                self.open_selected_note()
-            elif self.timeblock_pane_focused:
-                tb = timeblock_cache.get_timeblock(DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md")
-                if 0 <= self.selected_timeblock_index < len(tb):
-                    t_sel, _ = tb[self.selected_timeblock_index]
-                    self.add_timeblock_entry(DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md", self.selected_date.strftime("%Y-%m-%d"), t_sel)
-        elif key == ord('o') and self.task_pane_focused:
-            self.open_selected_task()
-        elif key == ord('R') and self.non_side_by_side_mode == "tasks":
-            self.cycle_task_filter()
-        elif key == ord('x') and self.task_pane_focused:
-            self.delete_selected_task()
-        elif key == ord('z') and self.task_pane_focused:
-            self.cycle_selected_task_priority()
-        elif key == ord('A') and self.task_pane_focused:
-            self.toggle_archive_selected_task()
-        return True
 
-    def handle_mouse(self):
+    def move_selection(self, delta: int):
+        if self.task_pane_focused:
+            self.move_task_selection(delta)
+        elif self.note_pane_focused:
+            self.move_note_selection(delta)
+        elif self.timeblock_pane_focused:
+            self.move_timeblock_selection(delta)
+        else:
+            self.move_week(delta)
+
+    def activate_selection(self):
+        if self.task_pane_focused:
+            self.toggle_task()
+        elif self.note_pane_focused:
+            self.open_selected_note()
+        elif self.timeblock_pane_focused:
+            file_path = self.selected_diary_file()
+            tb = timeblock_cache.get_timeblock(file_path)
+            if 0 <= self.selected_timeblock_index < len(tb):
+                t_sel, _ = tb[self.selected_timeblock_index]
+                self.add_timeblock_entry(file_path, self.selected_date_str(), t_sel)
+
+    def handle_mouse(self) -> bool:
+        """Act on a mouse report; return whether it changed anything on screen."""
         try:
             _, mx, my, _, bstate = curses.getmouse()
             if bstate & curses.BUTTON4_PRESSED:
                 self.move_day(-1)
-            elif bstate & curses.BUTTON5_PRESSED:
+                return True
+            if bstate & curses.BUTTON5_PRESSED:
                 self.move_day(1)
+                return True
         except Exception as e:
             logging.error(f"Mouse event error: {e}")
+        return False
 
     def move_day(self, delta: int):
         self.selected_date += timedelta(days=delta)
@@ -1786,31 +2652,63 @@ class DiaryTUI:
         self.selected_note_index = max(0, min(self.selected_note_index + delta, max_idx))
 
     def move_timeblock_selection(self, delta: int):
-        date_str = self.selected_date.strftime("%Y-%m-%d")
-        tb = timeblock_cache.get_timeblock(DIARY_DIR / f"{date_str}.md")
+        tb = timeblock_cache.get_timeblock(self.selected_diary_file())
         if not tb:
             return
         max_idx = len(tb) - 1
         self.selected_timeblock_index = max(1, min(self.selected_timeblock_index + delta, max_idx))
 
+    def _read_line(self, y, x, maxlen) -> str:
+        """
+        Read a line typed at (y, x), echoing it here rather than switching the
+        terminal into echo mode and back around getstr(). Enter accepts the
+        line, Escape abandons it (returning ""), and input stops at maxlen
+        characters or the right edge of the screen.
+        """
+        maxlen = min(maxlen, self.stdscr.getmaxyx()[1] - x - 1)
+        buf = []
+        self.stdscr.move(y, x)
+        while True:
+            ch = self.stdscr.get_wch()
+            if ch in ("\n", "\r", curses.KEY_ENTER):
+                return "".join(buf)
+            if ch == "\x1b":
+                return ""
+            if ch in ("\b", "\x7f", curses.KEY_BACKSPACE):
+                if buf:
+                    buf.pop()
+                    # Redraw the tail so wide characters are erased whole.
+                    self.stdscr.move(y, x)
+                    self.stdscr.clrtoeol()
+                    try:
+                        self.stdscr.addstr(y, x, "".join(buf))
+                    except curses.error:
+                        pass
+            elif isinstance(ch, str) and ch.isprintable() and len(buf) < maxlen:
+                buf.append(ch)
+                try:
+                    self.stdscr.addstr(ch)
+                except curses.error:
+                    pass
+
     def perform_search(self, height, width):
-        curses.echo()
         try:
-            self.stdscr.addstr(height - 1, 2, "Search: ")
+            self.stdscr.move(height - 1, 2)
             self.stdscr.clrtoeol()
-            query = self.stdscr.getstr(height - 1, 10, 100).decode("utf-8").strip()
+            self.stdscr.addstr("Search: ")
+            query = self._read_line(height - 1, 10, 100).strip()
         except Exception as e:
             logging.error(f"Search input error: {e}")
             query = ""
-        curses.noecho()
         if query:
             self.search_list = search_diary(query)
-            self.search_results = set(self.search_list)
+            self.search_results = frozenset(self.search_list)
             if self.search_list:
                 self.current_search_idx = 0
                 self.select_search_result()
         else:
-            self.search_results = set()
+            self.search_list = []
+            self.search_results = frozenset()
             self.current_search_idx = -1
 
     def navigate_search(self, direction: int):
@@ -1828,35 +2726,17 @@ class DiaryTUI:
                 logging.error(f"Search result date parse error: {e}")
 
     def perform_tag_filter(self, height, width):
-        curses.echo()
         try:
-            self.stdscr.addstr(height - 1, 2, "Filter by tag: ")
+            self.stdscr.move(height - 1, 2)
             self.stdscr.clrtoeol()
-            tag = self.stdscr.getstr(height - 1, 18, 50).decode("utf-8").strip()
+            self.stdscr.addstr("Filter by tag: ")
+            tag = self._read_line(height - 1, 18, 50).strip()
         except Exception as e:
             logging.error(f"Tag filter input error: {e}")
             tag = ""
-        curses.noecho()
         self.tag_results = filter_by_tag(tag) if tag else set()
         self.preview_scroll = 0
 
-    def perform_context_filter(self, height, width):
-        curses.echo()
-        try:
-            self.stdscr.addstr(height - 1, 2, "Filter by context tag: ")
-            self.stdscr.clrtoeol()
-            context_tag = self.stdscr.getstr(height - 1, 25, 50).decode("utf-8").strip()
-        except Exception as e:
-            logging.error(f"Context filter input error: {e}")
-            context_tag = ""
-        curses.noecho()
-        if context_tag:
-            self.context_filter = context_tag
-        else:
-            self.context_filter = None
-        self.selected_task_index = 0
-        self.preview_scroll = 0
-
     def edit_entry(self, file_path: Path):
         if not file_path.exists():
             file_path.touch()
@@ -1881,24 +2761,23 @@ class DiaryTUI:
             curses.cbreak()
             self.stdscr.keypad(True)
             curses.curs_set(0)
+            # The editor drew over the terminal; repaint it in full once.
+            self.stdscr.clearok(True)
 
     def add_note(self, file_path: Path, date_str: str):
         try:
-            curses.echo()
             self.stdscr.addstr(0, 2, "Enter note: ")
             self.stdscr.clrtoeol()
-            note = self.stdscr.getstr(0, 14, 100).decode("utf-8").strip()
-            curses.noecho()
+            note = self._read_line(0, 14, 100).strip()
             if note:
                 now = datetime.now().strftime("%Y-%m-%dT%H:%M")
-                with file_path.open("a", encoding="utf-8") as f:
-                    f.write(f"- [{now}] {note}\n")
-                metadata_cache.rewrite_front_matter(file_path, metadata_cache.get_metadata(file_path))
+                # One read and one write: the note rides along with the
+                # dateModified update instead of being appended separately.
+                metadata_cache.rewrite_front_matter(file_path, metadata_cache.get_metadata(file_path),
+                                                    append=f"- [{now}] {note}\n")
             self.stdscr.getch()
         except Exception as e:
             logging.error(f"Add note error: {e}")
-        finally:
-            curses.noecho()
 
     def create_new_task(self):
         height, width = self.stdscr.getmaxyx()
@@ -1920,30 +2799,39 @@ class DiaryTUI:
         else:
             self.display_error("Task creation cancelled.")
 
+    def _on_selected_task(self, op, success_msg=None, refresh=True):
+        """
+        Run op(task_file) on the selected task, if there is one and its file
+        can be found. When op reports success, success_msg (if any) is shown
+        and, if refresh is set, the task list is re-read. Returns op's result.
+        """
+        task_file = self.get_selected_task_file()
+        if not task_file:
+            return False
+        ok = op(task_file)
+        if ok:
+            if success_msg:
+                self.display_error(success_msg)
+            if refresh:
+                self.read_tasks_cache()
+        return ok
+
     def toggle_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    self.task_manager.toggle_task_status(file)
-                    break
-            self.read_tasks_cache()
+        self._on_selected_task(self.task_manager.toggle_task_status)
+
+    def resolve_task_file(self, task: dict):
+        # The index records each task's path, so an action normally touches
+        # only that file; a zettelid lookup in the cached notes listing is the
+        # fallback for entries whose file has moved since the last reindex.
+        file_path = task.get("file_path")
+        if file_path:
+            task_file = Path(file_path)
+            if task_file.is_file():
+                return task_file
+        return note_file_for_prefix(task.get("zettelid"))
 
     def open_selected_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    self.open_file_in_editor(file)
-                    break
+        self._on_selected_task(self.open_file_in_editor, refresh=False)
 
     def open_selected_note(self):
         self.read_notes_cache()
@@ -1964,53 +2852,34 @@ class DiaryTUI:
         self.preview_scroll = 0
 
     def delete_selected_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        task = self.tasks_list[self.selected_task_index]
-        filename_prefix = task.get("zettelid")
-        task_title = task.get("title")
-        for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-            if file.is_file():
-                delete_confirm = f"Delete task '{task_title}' ({filename_prefix})? (y/n): "
-                self.stdscr.addstr(0, 2, delete_confirm)
-                self.stdscr.clrtoeol()
-                self.stdscr.refresh()
-                confirm = self.stdscr.getch()
-                if confirm in (ord('y'), ord('Y')):
-                    if self.task_manager.delete_task(file):
-                        self.display_error("Task deleted successfully.")
-                        self.selected_task_index = max(0, self.selected_task_index - 1)
-                        self.read_tasks_cache()
-                break
+        def confirm_and_delete(task_file):
+            task = self.tasks_list[self.selected_task_index]
+            delete_confirm = f"Delete task '{task.get('title')}' ({task.get('zettelid')})? (y/n): "
+            self.stdscr.addstr(0, 2, delete_confirm)
+            self.stdscr.clrtoeol()
+            self.stdscr.refresh()
+            if self.stdscr.getch() not in (ord('y'), ord('Y')):
+                return False
+            return self.task_manager.delete_task(task_file)
+
+        if self._on_selected_task(confirm_and_delete, "Task deleted successfully.", refresh=False):
+            self.selected_task_index = max(0, self.selected_task_index - 1)
+            self.read_tasks_cache()
 
     def cycle_selected_task_priority(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        task = self.tasks_list[self.selected_task_index]
-        filename_prefix = task.get("zettelid")
-        for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-            if file.is_file():
-                if self.task_manager.cycle_task_priority(file):
-                    self.display_error("Task priority cycled.")
-                break
+        self._on_selected_task(self.task_manager.cycle_task_priority, "Task priority cycled.", refresh=False)
 
     def add_timeblock_entry(self, file_path: Path, date_str: str, selected_time: str):
         try:
-            curses.echo()
             prompt = f"Enter activity for {selected_time}: "
             self.stdscr.addstr(0, 2, prompt)
             self.stdscr.clrtoeol()
-            activity = self.stdscr.getstr(0, len(prompt) + 2, 100).decode("utf-8").strip()
-            curses.noecho()
+            activity = self._read_line(0, len(prompt) + 2, 100).strip()
             if activity:
                 success, msg = timeblock_cache.update_timeblock(file_path, selected_time, activity)
                 self.display_error(msg)
         except Exception as e:
             logging.error(f"Add timeblock entry error: {e}")
-        finally:
-            curses.noecho()
 
     def jump_to_today(self):
         self.selected_date = datetime.today()
@@ -2035,12 +2904,13 @@ class DiaryTUI:
             logging.error(f"Failed rewriting metadata for {file_path}")
 
     def list_links(self, height, width, file_path: Path):
-        text = get_diary_preview(file_path.stem)
-        links = parse_links_from_text(text)
+        links = self.get_links(file_path.stem)
         chosen = draw_links_menu(self.stdscr, links)
         if chosen:
             display, target = chosen
-            if re.match(r"^\d{4}-\d{2}-\d{2}$", target):
+            # Note names rarely have dashes at 4 and 7, so most are rejected
+            # before the regex runs.
+            if len(target) == 10 and target[4] == target[7] == "-" and _DATE_RE.match(target):
                 try:
                     self.selected_date = datetime.strptime(target, "%Y-%m-%d")
                 except Exception as e:
@@ -2049,60 +2919,60 @@ class DiaryTUI:
                 link_file = NOTES_DIR / f"{target}.md"
                 self.open_file_in_editor(link_file)
 
+    HELP_TEXT = (
+        "Key Bindings:",
+        "  h/LEFT   : Move left (day -1)",
+        "  l/RIGHT  : Move right (day +1)",
+        "  j/Down   : Move down one week / navigate list (tasks, notes, timeblock)",
+        "  k/Up     : Move up one week / navigate list (tasks, notes, timeblock)",
+        "  m/w/y    : Switch to Month/Week/Year view",
+        "  1        : Switch to Timeblock view",
+        "  2        : Switch to Tasks view",
+        "  3        : Switch to Preview view (fullscreen only)",
+        "  4        : Switch to Notes view (non-task files with dateCreated matching selected date)",
+        "  O        : Cycle side-by-side modes (Preview -> Tasks -> Timeblock -> Notes)",
+        "  a        : Add note to diary entry",
+        "  C        : Create New Task (Interactive Form)",
+        "  T        : Add empty timeblock template",
+        "  e        : Edit diary entry",
+        "  t        : Jump to today",
+        "  /        : Search diary",
+        "  n/p      : Navigate search results",
+        "  f        : Filter by tag",
+        "  c        : Filter by context tag",
+        "  M/W/P/I  : Toggle metadata (meditate/workout/pomodoros/important)",
+        "  L        : List links",
+        "  0        : Toggle focus between list panes",
+        "  Enter    : In list view, open or toggle selected file (task: toggle status, note: open in editor)",
+        "  R        : Cycle task filter (open -> in-progress -> done -> all -> archive) [Tasks view]",
+        "  o        : Open selected task in editor [Tasks view]",
+        "  x        : Delete selected task (Tasks view)",
+        "  z        : Cycle task priority (Tasks view)",
+        "  A        : Toggle archive status of selected task (Tasks view)",
+        "  Ctrl+P   : Command Palette",
+        "  q        : Quit",
+        "",
+        "Press any key to close this help."
+    )
+
     def show_help(self, height, width):
-        help_text = [
-            "Key Bindings:",
-            "  h/LEFT   : Move left (day -1)",
-            "  l/RIGHT  : Move right (day +1)",
-            "  j/Down   : Move down one week / navigate list (tasks, notes, timeblock)",
-            "  k/Up     : Move up one week / navigate list (tasks, notes, timeblock)",
-            "  m/w/y    : Switch to Month/Week/Year view",
-            "  1        : Switch to Timeblock view",
-            "  2        : Switch to Tasks view",
-            "  3        : Switch to Preview view (fullscreen only)",
-            "  4        : Switch to Notes view (non-task files with dateCreated matching selected date)",
-            "  O        : Cycle side-by-side modes (Preview -> Tasks -> Timeblock -> Notes)",
-            "  a        : Add note to diary entry",
-            "  C        : Create New Task (Interactive Form)",
-            "  T        : Add empty timeblock template",
-            "  e        : Edit diary entry",
-            "  t        : Jump to today",
-            "  /        : Search diary",
-            "  n/p      : Navigate search results",
-            "  f        : Filter by tag",
-            "  c        : Filter by context tag",
-            "  M/W/P/I  : Toggle metadata (meditate/workout/pomodoros/important)",
-            "  L        : List links",
-            "  0        : Toggle focus between list panes",
-            "  Enter    : In list view, open or toggle selected file (task: toggle status, note: open in editor)",
-            "  R        : Cycle task filter (open -> in-progress -> done -> all -> archive) [Tasks view]",
-            "  o        : Open selected task in editor [Tasks view]",
-            "  x        : Delete selected task (Tasks view)",
-            "  z        : Cycle task priority (Tasks view)",
-            "  A        : Toggle archive status of selected task (Tasks view)",
-            "  Ctrl+P   : Command Palette",
-            "  q        : Quit",
-            "",
-            "Press any key to close this help."
-        ]
-        popup_h = min(len(help_text) + 4, height - 2)
+        popup_h = min(len(self.HELP_TEXT) + 4, height - 2)
         popup_w = min(100, width - 4)
         start_y = (height - popup_h) // 2
         start_x = (width - popup_w) // 2
-        win = curses.newwin(popup_h, popup_w, start_y, start_x)
-        draw_rectangle(win, 0, 0, popup_h - 1, popup_w - 1)
-        try:
-            win.addstr(0, (popup_w - len(" Help ")) // 2, " Help ", curses.A_BOLD)
-        except curses.error:
-            pass
-        for idx, line in enumerate(help_text, start=2):
-            try:
-                win.addstr(idx, 2, line)
-            except curses.error:
-                pass
-        win.refresh()
-        win.getch()
-        del win
+        # The help text never changes, so the rendered pad is kept and only
+        # rebuilt when the popup size does.
+        cached = self._help_pad
+        if cached is None or cached[0] != (popup_h, popup_w):
+            pad = curses.newpad(popup_h, popup_w)
+            draw_rectangle(pad, 0, 0, popup_h - 1, popup_w - 1)
+            pad.addnstr(0, max(1, (popup_w - len(" Help ")) // 2), " Help ", popup_w - 2, curses.A_BOLD)
+            for idx, line in enumerate(self.HELP_TEXT[:popup_h - 3], start=2):
+                pad.addnstr(idx, 2, line, popup_w - 4)
+            cached = self._help_pad = ((popup_h, popup_w), pad)
+        pad = cached[1]
+        pad.refresh(0, 0, start_y, start_x, start_y + popup_h - 1, start_x + popup_w - 1)
+        pad.getch()
 
     def scroll_preview(self, key):
         if key == ord('u'):
@@ -2154,38 +3024,19 @@ class DiaryTUI:
         del win
 
     def get_week_start(self) -> datetime:
-        delta = (self.selected_date.weekday() + 1) % 7
-        return self.selected_date - timedelta(days=delta)
+        return datetime.combine(week_start_for(self.selected_date.date()), datetime.min.time())
 
     def get_month_start(self) -> datetime:
         return self.selected_date.replace(day=1)
 
-    def calculate_month_stats_from_date(self) -> dict: 
-        total_pomodoros = 0
-        total_workouts = 0
-        days_meditated = 0
+    def calculate_month_stats_from_date(self) -> dict:
         start_of_month = self.get_month_start()
-        current_month = start_of_month.month
-        current_year = start_of_month.year
-        if current_month == 12:
-            next_month = 1
-            next_year = current_year + 1
-        else:
-            next_month = current_month + 1
-            next_year = current_year
-        next_month_start = start_of_month.replace(year=next_year, month=next_month, day=1)
-        end_of_month = next_month_start - timedelta(days=1)
-        current_date = start_of_month
-        while current_date <= end_of_month:
-            file_path = DIARY_DIR / f"{current_date.strftime('%Y-%m-%d')}.md"
-            md = metadata_cache.get_metadata(file_path)
-            if md:
-                total_pomodoros += int(md.get("pomodoros", 0))
-                if md.get("workout", False):
-                    total_workouts += 1
-                if md.get("meditate", False):
-                    days_meditated += 1
-            current_date += timedelta(days=1)
+        # Only days that have an entry are visited, rather than stat()ing a
+        # path for every day of the month.
+        prefix = date_key(start_of_month.year, start_of_month.month, 1)[:-2]
+        total_pomodoros, total_workouts, days_meditated = sum_diary_stats(
+            metadata_cache.get_metadata(DIARY_DIR / f"{date_str}.md")
+            for date_str in existing_diary_dates() if date_str.startswith(prefix))
         return {
             "total_pomodoros": total_pomodoros,
             "total_workouts": total_workouts,
@@ -2195,15 +3046,14 @@ class DiaryTUI:
 
 
     def perform_context_filter(self, height, width):
-        curses.echo()
         try:
-            self.stdscr.addstr(height - 1, 2, "Filter by context tag: ")
+            self.stdscr.move(height - 1, 2)
             self.stdscr.clrtoeol()
-            context_tag = self.stdscr.getstr(height - 1, 25, 50).decode("utf-8").strip()
+            self.stdscr.addstr("Filter by context tag: ")
+            context_tag = self._read_line(height - 1, 25, 50).strip()
         except Exception as e:
             logging.error(f"Context filter input error: {e}")
             context_tag = ""
-        curses.noecho()
         if context_tag:
             self.context_filter = context_tag
         else:
@@ -2212,32 +3062,10 @@ class DiaryTUI:
         self.preview_scroll = 0
 
     def archive_selected_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    if self.task_manager.archive_task(file, archive=True):
-                        self.display_error("Task archived.")
-                        self.read_tasks_cache()
-                    break
+        self._on_selected_task(lambda f: self.task_manager.archive_task(f, archive=True), "Task archived.")
 
     def unarchive_selected_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    if self.task_manager.archive_task(file, archive=False):
-                        self.display_error("Task un-archived.")
-                        self.read_tasks_cache()
-                    break
+        self._on_selected_task(lambda f: self.task_manager.archive_task(f, archive=False), "Task un-archived.")
 
     def toggle_archive_selected_task(self):
         if self.task_filter == "archive":
@@ -2245,32 +3073,38 @@ class DiaryTUI:
         else:
             self.archive_selected_task()
 
+    # Static command table: (label, action, condition). Actions receive the
+    # TUI, the screen size and the selected day's diary file; a condition, if
+    # present, decides whether the command is offered at all.
+    PALETTE_COMMANDS = (
+        ("Jump to Today", lambda tui, h, w, f: tui.jump_to_today(), None),
+        ("Add Note", lambda tui, h, w, f: tui.add_note(f, f.stem), None),
+        ("Create New Task (Interactive Form)", lambda tui, h, w, f: tui.create_new_task(), None),
+        ("Edit Diary Entry", lambda tui, h, w, f: tui.edit_entry(f), None),
+        ("Toggle Meditate", lambda tui, h, w, f: tui.toggle_metadata(ord('M'), f), None),
+        ("Toggle Workout", lambda tui, h, w, f: tui.toggle_metadata(ord('W'), f), None),
+        ("Increment Pomodoros", lambda tui, h, w, f: tui.toggle_metadata(ord('P'), f), None),
+        ("Toggle Important", lambda tui, h, w, f: tui.toggle_metadata(ord('I'), f), None),
+        ("Switch to Month View", lambda tui, h, w, f: setattr(tui, 'current_view', 'month'), None),
+        ("Switch to Week View", lambda tui, h, w, f: setattr(tui, 'current_view', 'week'), None),
+        ("Switch to Year View", lambda tui, h, w, f: setattr(tui, 'current_view', 'year'), None),
+        ("Toggle Side-by-Side Layout", lambda tui, h, w, f: setattr(tui, 'is_side_by_side', not tui.is_side_by_side()), None),
+        ("Open Home File", lambda tui, h, w, f: tui.open_file_in_editor(HOME_FILE), None),
+        ("Search Diary", lambda tui, h, w, f: tui.perform_search(h, w), None),
+        ("Filter by Tag", lambda tui, h, w, f: tui.perform_tag_filter(h, w), None),
+        ("Filter by Context Tag", lambda tui, h, w, f: tui.perform_context_filter(h, w), None),
+        ("List Links", lambda tui, h, w, f: tui.list_links(h, w, f), None),
+        ("Archive Selected Task", lambda tui, h, w, f: tui.archive_selected_task(), lambda tui: tui.task_filter != "archive"),
+        ("Un-archive Selected Task", lambda tui, h, w, f: tui.unarchive_selected_task(), lambda tui: tui.task_filter == "archive"),
+        ("Show Archived Tasks", lambda tui, h, w, f: setattr(tui, 'task_filter', 'archive'), None),
+        ("Show Active Tasks", lambda tui, h, w, f: setattr(tui, 'task_filter', 'open'), None),
+    )
+
     def show_command_palette(self, height, width):
-        current_file = DIARY_DIR / f"{self.selected_date.strftime('%Y-%m-%d')}.md"
-        commands = [
-            ("Jump to Today", self.jump_to_today),
-            ("Add Note", lambda: self.add_note(current_file, self.selected_date.strftime("%Y-%m-%d"))),
-            ("Create New Task (Interactive Form)", self.create_new_task),
-            ("Edit Diary Entry", lambda: self.edit_entry(current_file)),
-            ("Toggle Meditate", lambda: self.toggle_metadata(ord('M'), current_file)),
-            ("Toggle Workout", lambda: self.toggle_metadata(ord('W'), current_file)),
-            ("Increment Pomodoros", lambda: self.toggle_metadata(ord('P'), current_file)),
-            ("Toggle Important", lambda: self.toggle_metadata(ord('I'), current_file)),
-            ("Switch to Month View", lambda: setattr(self, 'current_view', 'month')),
-            ("Switch to Week View", lambda: setattr(self, 'current_view', 'week')),
-            ("Switch to Year View", lambda: setattr(self, 'current_view', 'year')),
-            ("Toggle Side-by-Side Layout", lambda: setattr(self, 'is_side_by_side', not self.is_side_by_side())),
-            ("Open Home File", lambda: self.open_file_in_editor(HOME_FILE)),
-            ("Search Diary", lambda: self.perform_search(height, width)),
-            ("Filter by Tag", lambda: self.perform_tag_filter(height, width)),
-            ("Filter by Context Tag", lambda: self.perform_context_filter(height, width)),
-            ("List Links", lambda: self.list_links(height, width, current_file)),
-            ("Archive Selected Task", self.archive_selected_task, lambda: self.task_filter != "archive"),
-            ("Un-archive Selected Task", self.unarchive_selected_task, lambda: self.task_filter == "archive"),
-            ("Show Archived Tasks", lambda: setattr(self, 'task_filter', 'archive')),
-            ("Show Active Tasks", lambda: setattr(self, 'task_filter', 'open')),
-        ]
-        palette_h = min(len(commands) + 4, height - 4)
+        current_file = self.selected_diary_file()
+        filtered_commands = [(cmd_text, cmd_func) for cmd_text, cmd_func, condition in self.PALETTE_COMMANDS
+                             if condition is None or condition(self)]
+        palette_h = min(len(self.PALETTE_COMMANDS) + 4, height - 4)
         palette_w = min(60, width - 4)
         start_y = max(0, (height - palette_h) // 2)
         start_x = max(0, (width - palette_w) // 2)
@@ -2282,17 +3116,26 @@ class DiaryTUI:
             win.addstr(0, (palette_w - len(title)) // 2, title, curses.A_BOLD)
         except curses.error:
             pass
+
+        # Rows below the frame are never painted, rather than each one being
+        # attempted and its curses.error swallowed.
+        visible_rows = min(len(filtered_commands), palette_h - 3)
+
+        def draw_row(idx, mode):
+            if idx >= visible_rows:
+                return
+            try:
+                win.addstr(2 + idx, 2, filtered_commands[idx][0].ljust(palette_w - 4), mode)
+            except curses.error:
+                pass
+
         selected = 0
+        for idx in range(visible_rows):
+            draw_row(idx, curses.A_REVERSE if idx == selected else curses.A_NORMAL)
         while True:
-            filtered_commands = [(cmd_text, cmd_func) for cmd_text, cmd_func, condition in [(c[0], c[1], c[2]() if len(c)>2 else True) for c in commands] if condition]
-            for idx, (cmd_text, _) in enumerate(filtered_commands):
-                mode = curses.A_REVERSE if idx == selected else curses.A_NORMAL
-                try:
-                    win.addstr(2 + idx, 2, cmd_text.ljust(palette_w - 4), mode)
-                except curses.error:
-                    pass
             win.refresh()
             key = win.getch()
+            previous = selected
             if key in (curses.KEY_UP, ord('k')):
                 selected = (selected - 1) % len(filtered_commands)
             elif key in (curses.KEY_DOWN, ord('j')):
@@ -2301,61 +3144,83 @@ class DiaryTUI:
                 win.clear()
                 win.refresh()
                 try:
-                    filtered_commands[selected][1]()
+                    filtered_commands[selected][1](self, height, width, current_file)
                 except Exception as e:
                     logging.error(f"Error executing command '{filtered_commands[selected][0]}': {e}")
                 break
             elif key in (27, ord('q')):
                 break
+            # Only the rows whose selection state changed need repainting.
+            if selected != previous:
+                draw_row(previous, curses.A_NORMAL)
+                draw_row(selected, curses.A_REVERSE)
         win.clear()
         self.stdscr.touchwin()
         self.stdscr.refresh()
 
-    def archive_selected_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    if self.task_manager.archive_task(file, archive=True):
-                        self.display_error("Task archived.")
-                        self.read_tasks_cache()
-                    break
-
-    def unarchive_selected_task(self):
-        self.read_tasks_cache()
-        if not self.tasks_list:
-            return
-        if 0 <= self.selected_task_index < len(self.tasks_list):
-            task = self.tasks_list[self.selected_task_index]
-            filename_prefix = task.get("zettelid")
-            for file in NOTES_DIR.glob(f"{filename_prefix}*.md"):
-                if file.is_file():
-                    if self.task_manager.archive_task(file, archive=False):
-                        self.display_error("Task un-archived.")
-                        self.read_tasks_cache()
-                    break
-
 # ---------------------------------------------------------------------
 # CALENDAR DRAWING HELPERS
 # ---------------------------------------------------------------------
-def draw_single_month(stdscr, cal, year, month, start_x, start_y, highlight=None,
-                      search_results=None, tag_results=None, task_manager=None, current_date=None):
-    month_name = calendar.month_name[month]
-    title = f"{month_name} {year}"
-    try:
-        stdscr.addnstr(start_y, start_x, title.center(20), 20, curses.A_BOLD)
-    except curses.error:
-        pass
+def clipped_addnstr(win, y, x, text, n, attr, maxy, maxx):
+    """
+    addnstr() for a window of size (maxy, maxx): writes that start outside it
+    are skipped and the rest are truncated at the right edge, so callers need
+    no curses.error handler per cell.
+    """
+    if not (0 <= y < maxy and 0 <= x < maxx):
+        return
+    n = min(n, maxx - x)
+    if y == maxy - 1 and x + min(n, len(text)) >= maxx:
+        # curses reports an error for text that ends in the bottom-right cell.
+        try:
+            win.addnstr(y, x, text, n, attr)
+        except curses.error:
+            pass
+        return
+    win.addnstr(y, x, text, n, attr)
+
+_SUNDAY_CALENDAR = calendar.Calendar(calendar.SUNDAY)
+
+@lru_cache(maxsize=256)
+def month_day_grid(year, month):
+    """Weeks of the month as tuples of day numbers (0 outside it), Sunday first."""
+    return tuple(tuple(week) for week in _SUNDAY_CALENDAR.monthdayscalendar(year, month))
+
+@lru_cache(maxsize=64)
+def month_title(year, month, abbreviated=False):
+    """Centred month heading; calendar.month_name/month_abbr run strftime per lookup."""
+    if abbreviated:
+        return f"{calendar.month_abbr[month]} {year}".center(18)
+    return f"{calendar.month_name[month]} {year}".center(20)
+
+# Cell labels and date keys are reused across redraws instead of being
+# formatted afresh for every day cell.
+_DAY2 = ["  "] + ["%2d" % d for d in range(1, 32)]
+
+@lru_cache(maxsize=2048)
+def date_key(year, month, day):
+    return "%d-%02d-%02d" % (year, month, day)
+
+@lru_cache(maxsize=64)
+def month_date_keys(year, month):
+    """The month's date_key strings indexed by day number (index 0 unused)."""
+    return ("",) + tuple(date_key(year, month, day)
+                         for day in range(1, calendar.monthrange(year, month)[1] + 1))
+
+def draw_single_month(stdscr, year, month, start_x, start_y, highlight=None,
+                      search_results=None, tag_results=None, task_manager=None, current_date=None,
+                      diary_dates=None):
+    if diary_dates is None:
+        diary_dates = existing_diary_dates()
+    maxy, maxx = stdscr.getmaxyx()
+    date_attrs = calendar_date_attrs(date_key(year, month, 1)[:-2], diary_dates,
+                                     search_results, tag_results, task_manager)
+    clipped_addnstr(stdscr, start_y, start_x, month_title(year, month), 20, curses.A_BOLD, maxy, maxx)
     dow = "Su Mo Tu We Th Fr Sa"
-    try:
-        stdscr.addnstr(start_y + 1, start_x, dow, 20, curses.A_BOLD)
-    except curses.error:
-        pass
-    month_cal = cal.monthdayscalendar(year, month)
+    clipped_addnstr(stdscr, start_y + 1, start_x, dow, 20, curses.A_BOLD, maxy, maxx)
+    month_cal = month_day_grid(year, month)
+    keys = month_date_keys(year, month)
+    highlight_day = highlight[2] if highlight and highlight[:2] == (year, month) else 0
     offset = 2
     for week in month_cal:
         y = start_y + offset
@@ -2363,38 +3228,36 @@ def draw_single_month(stdscr, cal, year, month, start_x, start_y, highlight=None
             if day == 0:
                 continue
             col = start_x + idx * 3
-            date_str = f"{year}-{month:02}-{day:02}"
-            attr = get_date_attr(date_str, search_results, tag_results, task_manager, datetime(year, month, day).date())
-            if highlight and (year, month, day) == highlight:
+            attr = date_attrs.get(keys[day], curses.A_NORMAL)
+            if day == highlight_day:
                 attr = curses.color_pair(2) | curses.A_BOLD
-            try:
-                stdscr.addnstr(y, col, f"{day:2}", 2, attr)
-            except curses.error:
-                pass
+            clipped_addnstr(stdscr, y, col, _DAY2[day], 2, attr, maxy, maxx)
         offset += 1
 
-def draw_week_view(stdscr, cal, selected_date, start_x, start_y, search_results=None, tag_results=None, task_manager=None, current_date=None):
-    dow = (selected_date.weekday() + 1) % 7
-    start_week = selected_date - timedelta(days=dow)
+def draw_week_view(stdscr, selected_date, start_x, start_y, search_results=None, tag_results=None, task_manager=None, current_date=None,
+                   diary_dates=None):
+    if diary_dates is None:
+        diary_dates = existing_diary_dates()
+    start_week = datetime.combine(week_start_for(selected_date.date()), datetime.min.time())
+    maxy, maxx = stdscr.getmaxyx()
+    week_days = [start_week + timedelta(days=i) for i in range(7)]
+    date_attrs = calendar_date_attrs(tuple(date_key(d.year, d.month, d.day) for d in week_days), diary_dates,
+                                     search_results, tag_results, task_manager)
     title = f"Week of {start_week.strftime('%Y-%m-%d')} (Sun -> Sat)"
-    try:
-        stdscr.addnstr(start_y, start_x, title, 50, curses.A_BOLD)
-    except curses.error:
-        pass
-    for i in range(7):
-        day = start_week + timedelta(days=i)
-        label = f"{day.strftime('%a')} {day.day}"
-        date_obj = day.date()
-        date_str = day.strftime("%Y-%m-%d")
-        attr = get_date_attr(date_str, search_results, tag_results, task_manager, date_obj)
+    clipped_addnstr(stdscr, start_y, start_x, title, 50, curses.A_BOLD, maxy, maxx)
+    for i, day in enumerate(week_days):
+        label = "%s %d" % (calendar.day_abbr[day.weekday()], day.day)
+        attr = date_attrs.get(date_key(day.year, day.month, day.day), curses.A_NORMAL)
         if day.date() == selected_date.date():
             attr = curses.color_pair(2) | curses.A_BOLD
-        try:
-            stdscr.addnstr(start_y + 2, start_x + i * 12, label, 12, attr)
-        except curses.error:
-            pass
-
-def draw_year_view(stdscr, cal, year, start_x, start_y, highlight=None, search_results=None, tag_results=None, task_manager=None, current_date=None):
+        clipped_addnstr(stdscr, start_y + 2, start_x + i * 12, label, 12, attr, maxy, maxx)
+
+def draw_year_view(stdscr, year, start_x, start_y, highlight=None, search_results=None, tag_results=None, task_manager=None, current_date=None,
+                   diary_dates=None):
+    if diary_dates is None:
+        diary_dates = existing_diary_dates()
+    maxy, maxx = stdscr.getmaxyx()
+    date_attrs = calendar_date_attrs("%d-" % year, diary_dates, search_results, tag_results, task_manager)
     mini_w = 20
     mini_h = 8
     for m in range(1, 13):
@@ -2402,64 +3265,71 @@ def draw_year_view(stdscr, cal, year, start_x, start_y, highlight=None, search_r
         col = (m - 1) % 3
         x = start_x + col * (mini_w + 3)
         y = start_y + row * (mini_h + 2)
-        title = f"{calendar.month_abbr[m]} {year}"
-        try:
-            stdscr.addnstr(y, x, title.center(18), 18, curses.A_BOLD)
-            stdscr.addnstr(y + 1, x, "Su Mo Tu We Th Fr Sa", 20, curses.A_BOLD)
-        except curses.error:
-            pass
-        month_cal = cal.monthdayscalendar(year, m)
+        clipped_addnstr(stdscr, y, x, month_title(year, m, abbreviated=True), 18, curses.A_BOLD, maxy, maxx)
+        clipped_addnstr(stdscr, y + 1, x, "Su Mo Tu We Th Fr Sa", 20, curses.A_BOLD, maxy, maxx)
+        month_cal = month_day_grid(year, m)
+        keys = month_date_keys(year, m)
+        highlight_day = highlight[2] if highlight and highlight[:2] == (year, m) else 0
         offset = y + 2
         for week in month_cal:
             for idx, day in enumerate(week):
                 if day == 0:
                     continue
-                date_str = f"{year}-{m:02}-{day:02}"
-                date_obj = datetime(year, m, day).date()
-                attr = get_date_attr(date_str, search_results, tag_results, task_manager, date_obj)
-                if highlight and (year, m, day) == highlight:
+                attr = date_attrs.get(keys[day], curses.A_NORMAL)
+                if day == highlight_day:
                     attr = curses.color_pair(2) | curses.A_BOLD
-                try:
-                    stdscr.addnstr(offset, x + idx * 3, f"{day:2}", 2, attr)
-                except curses.error:
-                    pass
+                clipped_addnstr(stdscr, offset, x + idx * 3, _DAY2[day], 2, attr, maxy, maxx)
             offset += 1
 
-def get_date_attr(date_str, search_results, tag_results, task_manager, date_obj):
-    today = datetime.today().date()
-    if date_obj == today:
-        return curses.color_pair(3) | curses.A_BOLD
-
-    if task_manager:
-        due_tasks = task_manager.get_tasks_due_on_date(date_obj)
-        if due_tasks:
-            highest_priority = "low"
-            priority_order = {"high": 0, "normal": 1, "low": 2}
-            for task in due_tasks:
-                task_priority = task.get("priority", "normal")
-                if priority_order[task_priority] < priority_order[highest_priority]:
-                    highest_priority = task_priority
-
-            if highest_priority == "high":
-                return curses.color_pair(5) | curses.A_BOLD
-            elif highest_priority == "normal":
-                return curses.color_pair(6) | curses.A_BOLD
-            elif highest_priority == "low":
-                return curses.color_pair(3) | curses.A_BOLD
-
-    file_path = DIARY_DIR / f"{date_str}.md"
-    if file_path.exists():
-        md = metadata_cache.get_metadata(file_path)
-        tags = md.get("tags", [])
+# calendar_date_attrs results by (prefixes, today, metadata_cache.version),
+# each stored with the objects it was derived from; oldest entry first.
+_date_attrs_cache = {}
+_DATE_ATTRS_CACHE_SIZE = 8
+
+def calendar_date_attrs(prefixes, diary_dates, search_results, tag_results, task_manager) -> dict:
+    """
+    {date_str: curses attribute} for the calendar cells whose date starts with
+    prefixes (a string or tuple, as for str.startswith). Cells left out are
+    drawn A_NORMAL. Precedence, highest first: today, tasks due (by their
+    highest priority), then diary entries (important, tag match, search
+    match, plain).
+
+    The result is reused until the diary listing, the search or tag results,
+    the task index or any cached metadata changes, or the day rolls over, so
+    redrawing an unchanged calendar stats no files.
+    """
+    due_priorities = task_manager.due_priorities() if task_manager else None
+    key = (prefixes, date.today(), metadata_cache.version)
+    sources = (diary_dates, search_results, tag_results, due_priorities)
+    cached = _date_attrs_cache.get(key)
+    if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+        return cached[1]
+    attrs = {}
+    for date_str in diary_dates:
+        if not date_str.startswith(prefixes):
+            continue
+        tags = metadata_cache.get_metadata(DIARY_DIR / f"{date_str}.md").get("tags", [])
         if "important" in tags:
-            return curses.color_pair(5) | curses.A_BOLD
-        if tag_results and date_str in tag_results:
-            return curses.color_pair(4) | curses.A_BOLD
-        if search_results and date_str in search_results:
-            return curses.color_pair(3) | curses.A_BOLD
-        return curses.color_pair(1)
-
-    return curses.A_NORMAL
+            attrs[date_str] = curses.color_pair(5) | curses.A_BOLD
+        elif tag_results and date_str in tag_results:
+            attrs[date_str] = curses.color_pair(4) | curses.A_BOLD
+        elif search_results and date_str in search_results:
+            attrs[date_str] = curses.color_pair(3) | curses.A_BOLD
+        else:
+            attrs[date_str] = curses.color_pair(1)
+    if due_priorities is not None:
+        priority_attrs = {"high": curses.color_pair(5) | curses.A_BOLD,
+                          "normal": curses.color_pair(6) | curses.A_BOLD,
+                          "low": curses.color_pair(3) | curses.A_BOLD}
+        for date_str, priority in due_priorities.items():
+            if date_str.startswith(prefixes):
+                attrs[date_str] = priority_attrs.get(priority, priority_attrs["normal"])
+    today = key[1]
+    attrs[date_key(today.year, today.month, today.day)] = curses.color_pair(3) | curses.A_BOLD
+    if len(_date_attrs_cache) >= _DATE_ATTRS_CACHE_SIZE:
+        del _date_attrs_cache[next(iter(_date_attrs_cache))]
+    _date_attrs_cache[key] = (sources, attrs)
+    return attrs
 
 # ---------------------------------------------------------------------
 # MAIN FUNCTION
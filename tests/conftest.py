@@ -0,0 +1,9 @@
+"""
+Shared setup for the diary-tui tests.
+"""
+import os
+import tempfile
+
+# diary_tui reads (and on first run creates) its config under $HOME when it
+# is imported, so point HOME at a scratch directory before any test does.
+os.environ["HOME"] = tempfile.mkdtemp(prefix="diary-tui-tests-")
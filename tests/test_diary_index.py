@@ -0,0 +1,150 @@
+"""
+Tests for the in-memory diary search index in diary-tui.
+"""
+import os
+import threading
+
+import pytest
+
+from diary_tui.diary_tui import (
+    MMAP_MIN_SIZE,
+    DiaryIndex,
+    MetadataCache,
+    metadata_search_text,
+)
+
+ENTRIES = {
+    "2024-01-01": "---\ntags: [important]\npomodoros: 3\n---\nWent for a run. Apple pie later.\n",
+    "2024-01-02": "---\ntags: [work]\n---\nMeeting about the Straße project. ÜNÏCODE notes.\n",
+    "2024-01-03": "---\nmood: cheerful\n---\nNothing much. x\n",
+    "2024-01-04": "No frontmatter here, just an apple.\n",
+    "2024-01-05": "---\ntags: [gym, important]\nworkout: true\n---\nGym session: squats.\n",
+}
+
+QUERIES = [
+    "apple", "APPLE", "run", "straße", "STRASSE", "ünïcode", "ÜNÏ", "ße", "x", "an", "",
+    "important", "cheerful", "pomodoros: 3", "mood", "gym", "squats", "nothing here", "zzz",
+]
+
+
+def write_entry(diary_dir, date_str, text, bump=0):
+    path = diary_dir / f"{date_str}.md"
+    path.write_text(text, encoding="utf-8")
+    if bump:
+        # Make sure the index sees a new mtime even within one clock tick.
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+    return path
+
+
+def brute_force_search(diary_dir, query):
+    """What search() should return: a substring scan of every entry."""
+    query = query.lower()
+    cache = MetadataCache()
+    results = []
+    for path in sorted(diary_dir.glob("*.md")):
+        text = path.read_text(encoding="utf-8").lower()
+        if query in text or query in metadata_search_text(cache.get_metadata(path)):
+            results.append(path.stem)
+    return results
+
+
+@pytest.fixture
+def diary_dir(tmp_path):
+    for date_str, text in ENTRIES.items():
+        write_entry(tmp_path, date_str, text)
+    return tmp_path
+
+
+def check_all_queries(index, diary_dir, queries=QUERIES):
+    index.refresh()
+    for query in queries:
+        assert index.search(query) == brute_force_search(diary_dir, query), query
+
+
+def test_search_matches_brute_force(diary_dir):
+    check_all_queries(DiaryIndex(diary_dir), diary_dir)
+
+
+def test_short_queries_scan_every_entry(diary_dir):
+    index = DiaryIndex(diary_dir)
+    index.refresh()
+    assert index.search("x") == brute_force_search(diary_dir, "x")
+    assert index.search("ün") == ["2024-01-02"]
+    assert index.search("") == sorted(ENTRIES)
+
+
+def test_metadata_only_hits(diary_dir):
+    index = DiaryIndex(diary_dir)
+    index.refresh()
+    # "cheerful" and "workout" appear only in the frontmatter values and keys.
+    assert index.search("cheerful") == ["2024-01-03"]
+    assert index.search("workout") == ["2024-01-05"]
+
+
+def test_search_after_edit(diary_dir):
+    index = DiaryIndex(diary_dir)
+    index.refresh()
+    assert index.search("apple") == ["2024-01-01", "2024-01-04"]
+    write_entry(diary_dir, "2024-01-01", "---\ntags: [calm]\n---\nBanana bread instead.\n", bump=1000)
+    write_entry(diary_dir, "2024-01-06", "A new entry mentioning apples.\n")
+    check_all_queries(index, diary_dir, QUERIES + ["banana", "calm", "apples"])
+    assert index.search("apple") == ["2024-01-04", "2024-01-06"]
+    assert index.search("calm") == ["2024-01-01"]
+
+
+def test_search_after_delete(diary_dir):
+    index = DiaryIndex(diary_dir)
+    index.refresh()
+    (diary_dir / "2024-01-04.md").unlink()
+    (diary_dir / "2024-01-02.md").unlink()
+    check_all_queries(index, diary_dir)
+    assert index.search("apple") == ["2024-01-01"]
+    assert "2024-01-02" not in index.content_lc
+    assert all("2024-01-02" not in dates for dates in index.trigrams.values())
+
+
+def test_trigrams_match_a_fresh_build_after_changes(diary_dir):
+    index = DiaryIndex(diary_dir)
+    index.refresh()
+    write_entry(diary_dir, "2024-01-03", "Rewritten completely.\n", bump=1000)
+    (diary_dir / "2024-01-05.md").unlink()
+    index.refresh()
+    fresh = DiaryIndex(diary_dir)
+    fresh.refresh()
+    assert index.trigrams == fresh.trigrams
+
+
+def test_large_entries_are_searched_from_disk(diary_dir):
+    padding = "filler text " * (MMAP_MIN_SIZE // 12 + 1)
+    write_entry(diary_dir, "2024-02-01", "---\ntags: [big]\n---\n" + padding + "Needle Ünïcode end.\n")
+    index = DiaryIndex(diary_dir)
+    check_all_queries(index, diary_dir, QUERIES + ["needle", "NEEDLE", "big", "ünïcode end"])
+    assert "2024-02-01" in index.large_files
+    assert index.search("needle") == ["2024-02-01"]
+
+
+def test_filter_by_tag_follows_edits(diary_dir):
+    index = DiaryIndex(diary_dir)
+    index.refresh()
+    assert index.filter_by_tag("important") == {"2024-01-01", "2024-01-05"}
+    write_entry(diary_dir, "2024-01-01", "---\ntags: [work]\n---\nEdited.\n", bump=1000)
+    index.refresh()
+    assert index.filter_by_tag("important") == {"2024-01-05"}
+    assert index.filter_by_tag("work") == {"2024-01-01", "2024-01-02"}
+
+
+def test_search_during_background_refresh_sees_whole_index(tmp_path):
+    """A search racing the startup build sees none of it or all of it."""
+    dates = [f"2023-{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 29)]
+    for i, date_str in enumerate(dates):
+        write_entry(tmp_path, date_str, f"Entry {i}. " + ("needle " if i % 3 == 0 else "") + "hay " * 200)
+    expected = brute_force_search(tmp_path, "needle")
+
+    index = DiaryIndex(tmp_path)
+    thread = threading.Thread(target=index.refresh)
+    thread.start()
+    seen = [index.search("needle") for _ in range(20)]
+    thread.join()
+    assert all(result in ([], expected) for result in seen)
+    assert index.search("needle") == expected
@@ -0,0 +1,186 @@
+"""
+Tests for reading and rewriting YAML frontmatter in diary-tui.
+"""
+import os
+
+import pytest
+import yaml
+
+from diary_tui.diary_tui import (
+    FRONTMATTER_CHUNK_BYTES,
+    MetadataCache,
+    _scan_frontmatter,
+    read_frontmatter,
+)
+
+
+def split_note(path):
+    """Return (frontmatter dict, body bytes) of a rewritten note."""
+    data = path.read_bytes()
+    assert data.startswith(b"---\n")
+    end = data.index(b"\n---\n", 3)
+    return yaml.safe_load(data[4:end]), data[end + 5:]
+
+
+def scan(path, **kwargs):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return _scan_frontmatter(fd, **kwargs)
+    finally:
+        os.close(fd)
+
+
+@pytest.fixture
+def cache():
+    return MetadataCache()
+
+
+def test_same_size_rewrite_is_in_place(tmp_path, cache):
+    """A frontmatter of unchanged size is overwritten without replacing the file."""
+    note = tmp_path / "task.md"
+    note.write_text("---\nstatus: open\n---\nbody line\n")
+    assert cache.rewrite_front_matter(note, {"status": "open"})
+    inode = note.stat().st_ino
+    size = note.stat().st_size
+
+    assert cache.rewrite_front_matter(note, {"status": "done"})
+    assert note.stat().st_ino == inode
+    assert note.stat().st_size == size
+    md, body = split_note(note)
+    assert md["status"] == "done"
+    assert body == b"body line\n"
+
+
+@pytest.mark.parametrize("old_front, new_md", [
+    ("status: open\n", {"status": "in-progress", "priority": "high", "tags": ["task", "work"]}),
+    ("status: open\npriority: high\ntags: [task, work, errands]\ncontexts: [Home]\n", {"status": "done"}),
+])
+def test_resized_rewrite_replaces_file_and_keeps_body(tmp_path, cache, old_front, new_md):
+    """Growing or shrinking the frontmatter rewrites the note, body untouched."""
+    note = tmp_path / "task.md"
+    body = b"# Heading\n\nSome text with unicode \xc3\xa9 and --- dashes.\n---\nnot a marker\n"
+    note.write_bytes(b"---\n" + old_front.encode() + b"---\n" + body)
+    os.chmod(note, 0o640)
+
+    assert cache.rewrite_front_matter(note, dict(new_md))
+    md, new_body = split_note(note)
+    assert {k: md[k] for k in new_md} == new_md
+    assert "dateModified" in md
+    assert new_body == body
+    assert note.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["task.md"]
+
+
+def test_rewrite_without_frontmatter_keeps_whole_file_as_body(tmp_path, cache):
+    note = tmp_path / "plain.md"
+    note.write_text("Just a body.\nSecond line.\n")
+    assert cache.rewrite_front_matter(note, {"title": "Plain"})
+    md, body = split_note(note)
+    assert md["title"] == "Plain"
+    assert body == b"Just a body.\nSecond line.\n"
+
+
+def test_rewrite_with_unclosed_frontmatter_replaces_everything(tmp_path, cache):
+    """An unclosed block swallows the rest of the file, as when it is read."""
+    note = tmp_path / "broken.md"
+    note.write_text("---\ntitle: Broken\nno closing marker\n")
+    assert read_frontmatter(note) is None
+    assert cache.rewrite_front_matter(note, {"title": "Fixed"})
+    md, body = split_note(note)
+    assert md["title"] == "Fixed"
+    assert body == b""
+
+
+def test_rewrite_creates_missing_file(tmp_path, cache):
+    note = tmp_path / "new.md"
+    assert cache.rewrite_front_matter(note, {"title": "New"})
+    md, body = split_note(note)
+    assert md["title"] == "New"
+    assert body == b""
+
+
+@pytest.mark.parametrize("same_size", [True, False])
+def test_append_adds_text_after_body(tmp_path, cache, same_size):
+    note = tmp_path / "2024-01-01.md"
+    note.write_text("---\npomodoros: 1\n---\nEntry.\n")
+    if same_size:
+        assert cache.rewrite_front_matter(note, {"pomodoros": 1})
+    md = {"pomodoros": 2} if same_size else {"pomodoros": 2, "tags": ["important"]}
+    assert cache.rewrite_front_matter(note, md, append="- [2024-01-01T10:00] note\n")
+    md, body = split_note(note)
+    assert md["pomodoros"] == 2
+    assert body == b"Entry.\n- [2024-01-01T10:00] note\n"
+
+
+@pytest.mark.parametrize("same_size", [True, False])
+def test_rewrite_keeps_body_larger_than_read_chunk(tmp_path, cache, same_size):
+    note = tmp_path / "big.md"
+    body = b"".join(b"line %06d of a long entry\n" % i for i in range(10000))
+    assert len(body) > 64 * 1024
+    note.write_bytes(b"---\nstatus: open\n---\n" + body)
+    if same_size:
+        assert cache.rewrite_front_matter(note, {"status": "open"})
+        new_md = {"status": "done"}
+    else:
+        new_md = {"status": "done", "priority": "low"}
+    assert cache.rewrite_front_matter(note, new_md)
+    md, new_body = split_note(note)
+    assert md["status"] == "done"
+    assert new_body == body
+
+
+def test_failed_rewrite_leaves_original_intact(tmp_path, cache, monkeypatch):
+    note = tmp_path / "task.md"
+    original = b"---\nstatus: open\n---\nbody\n"
+    note.write_bytes(original)
+
+    def failing_fsync(fd):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+    assert not cache.rewrite_front_matter(note, {"status": "open", "priority": "high"})
+    assert note.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["task.md"]
+
+
+def test_rewrite_updates_cache(tmp_path, cache):
+    note = tmp_path / "task.md"
+    note.write_text("---\nstatus: open\n---\nbody\n")
+    assert cache.get_metadata(note) == {"status": "open"}
+    version = cache.version
+    assert cache.rewrite_front_matter(note, {"status": "done"})
+    assert cache.get_metadata(note)["status"] == "done"
+    assert cache.version != version
+
+
+def test_scan_without_frontmatter(tmp_path):
+    note = tmp_path / "plain.md"
+    note.write_text("no frontmatter\n---\n")
+    buf, start, match = scan(note)
+    assert start == 0
+    assert match is None
+
+
+def test_scan_finds_marker_past_first_chunk(tmp_path):
+    note = tmp_path / "long.md"
+    front = b"".join(b"key%05d: value\n" % i for i in range(FRONTMATTER_CHUNK_BYTES // 8))
+    assert len(front) > FRONTMATTER_CHUNK_BYTES
+    note.write_bytes(b"---\n" + front + b"---\nbody\n")
+    buf, start, match = scan(note)
+    assert start == 4
+    assert buf[start:match.start()] == front
+    assert read_frontmatter(note) == front
+
+
+def test_scan_treats_oversized_block_as_unclosed(tmp_path):
+    note = tmp_path / "huge.md"
+    front = b"x: " + b"y" * 5000 + b"\n"
+    note.write_bytes(b"---\n" + front + b"---\nbody\n")
+    assert scan(note, max_bytes=1000)[2] is None
+    assert scan(note, max_bytes=None)[2] is not None
+
+
+def test_scan_accepts_marker_with_trailing_whitespace(tmp_path):
+    note = tmp_path / "crlf.md"
+    note.write_bytes(b"---\r\ntitle: x\r\n--- \r\nbody\r\n")
+    assert read_frontmatter(note) == b"title: x\r\n"
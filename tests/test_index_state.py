@@ -0,0 +1,98 @@
+"""
+Tests for the task index state that diary-tui saves between runs.
+"""
+import json
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from diary_tui.diary_tui import TaskManager, process_file
+
+NOTES = {
+    "due-date.md": "---\ntitle: Due date\ntags: [task]\ndue: 2024-05-01\npriority: high\n---\nbody\n",
+    "dated.md": "---\ntitle: Dated\ntags: [task]\ndate: 2024-01-02\ndue: 2024-01-09\n---\n",
+    "stamps.md": ("---\ntitle: Stamps\ntags: [task]\ncreated: 2024-01-01T10:30:00+01:00\n"
+                  "seen: [2024-02-01, 2024-02-02 08:00:00]\n---\n"),
+    "binary.md": "---\ntitle: Binary\ntags: [task]\nblob: !!binary aGVsbG8=\n---\n",
+    "note.md": "---\ntitle: Not a task\ntags: [idea]\n---\n",
+}
+
+
+def wait_for_index(tm, timeout=10):
+    # Indexing runs on the manager's worker thread.
+    deadline = time.monotonic() + timeout
+    while tm.dirty:
+        if time.monotonic() > deadline:
+            pytest.fail("task index was not built")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def notes_dir(tmp_path):
+    notes = tmp_path / "notes"
+    notes.mkdir()
+    for name, text in NOTES.items():
+        (notes / name).write_text(text)
+    return notes
+
+
+def restored_tasks(notes_dir, state_file):
+    """Tasks as the next start reads them back, before any reindex."""
+    tm = TaskManager.__new__(TaskManager)
+    tm.index_state_file = state_file
+    tm.tasks_cache = []
+    files = tm._load_index_state()
+    return files, {task["file_path"]: task for task in tm.tasks_cache}
+
+
+def test_restored_tasks_match_freshly_parsed_ones(notes_dir, tmp_path):
+    state_file = tmp_path / "state" / "index_state.json"
+    wait_for_index(TaskManager(notes_dir, state_file))
+
+    files, restored = restored_tasks(notes_dir, state_file)
+    for name in ("due-date.md", "dated.md", "stamps.md"):
+        path = str(notes_dir / name)
+        assert restored[path] == process_file(path)
+
+    stamps = restored[str(notes_dir / "stamps.md")]
+    assert stamps["created"] == datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+    assert stamps["created"].utcoffset() == timedelta(hours=1)
+    assert stamps["seen"] == [date(2024, 2, 1), datetime(2024, 2, 2, 8, 0)]
+    assert isinstance(restored[str(notes_dir / "due-date.md")]["due"], date)
+
+
+def test_unsaveable_task_is_parsed_again_next_time(notes_dir, tmp_path):
+    state_file = tmp_path / "index_state.json"
+    wait_for_index(TaskManager(notes_dir, state_file))
+
+    files, restored = restored_tasks(notes_dir, state_file)
+    binary = str(notes_dir / "binary.md")
+    assert binary not in restored
+    assert binary not in files
+    assert str(notes_dir / "note.md") in files
+
+    tm = TaskManager(notes_dir, state_file)
+    wait_for_index(tm)
+    task = next(t for t in tm.tasks_cache if t["file_path"] == binary)
+    assert task["blob"] == b"hello"
+
+
+def test_state_file_is_replaced_whole(notes_dir, tmp_path):
+    state_file = tmp_path / "index_state.json"
+    state_file.write_text("stale contents")
+    wait_for_index(TaskManager(notes_dir, state_file))
+
+    saved = json.loads(state_file.read_text())
+    assert saved["version"] == TaskManager.INDEX_STATE_VERSION
+    assert len(saved["tasks"]) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index_state.json", "notes"]
+
+
+def test_state_from_an_older_version_is_ignored(notes_dir, tmp_path):
+    state_file = tmp_path / "index_state.json"
+    state_file.write_text(json.dumps({"version": TaskManager.INDEX_STATE_VERSION - 1,
+                                      "files": {"x.md": [1, 2]}, "tasks": [{"file_path": "x.md"}]}))
+    files, restored = restored_tasks(notes_dir, state_file)
+    assert files == {}
+    assert restored == {}